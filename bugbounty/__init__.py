@@ -11,9 +11,24 @@ __license__ = "GPL-3.0"
 
 from .config import config
 from .db import init_db, start_run, end_run
-from .runner import TaskRunner
-from .summarizer import Summarizer
-from .notifier import TelegramNotifier
+
+# Heavy modules (telegram, jinja2, jsonpath) are imported on first access
+_LAZY_ATTRS = {
+    "TaskRunner": ".runner",
+    "Summarizer": ".summarizer",
+    "TelegramNotifier": ".notifier",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "config",
@@ -0,0 +1,138 @@
+"""
+In-process glue steps for the bug bounty tool.
+Tasks of kind builtin:<op> run one of these instead of spawning a shell.
+"""
+
+import re
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List
+
+
+# Task kinds starting with this prefix name an entry of BUILTIN_OPS
+BUILTIN_PREFIX = "builtin:"
+
+
+def _input_paths(args: Dict[str, Any]) -> List[Path]:
+    """Get the 'inputs' argument as a list of paths."""
+    inputs = args.get('inputs')
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    if not inputs:
+        raise ValueError("missing 'inputs'")
+    return [Path(str(path)) for path in inputs]
+
+
+def _output_path(args: Dict[str, Any]) -> Path:
+    """Get the 'output' argument as a path."""
+    output = args.get('output')
+    if not output:
+        raise ValueError("missing 'output'")
+    return Path(str(output))
+
+
+def _iter_lines(paths: List[Path]) -> Iterator[bytes]:
+    """Yield the lines of each file in turn, without their line endings."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            for line in f:
+                yield line.rstrip(b'\r\n')
+
+
+@contextmanager
+def _atomic_output(path: Path) -> Iterator[BinaryIO]:
+    """
+    Open a file for writing that replaces path only once complete.
+    
+    Writing through a temporary file also lets an op read from and write to
+    the same file (e.g. dedup in place).
+    """
+    temp_file = path.with_name(path.name + '.tmp')
+    try:
+        with open(temp_file, 'wb') as f:
+            yield f
+        temp_file.replace(path)
+    except BaseException:
+        if temp_file.exists():
+            temp_file.unlink()
+        raise
+
+
+def op_write(args: Dict[str, Any]):
+    """
+    Write text to a file.
+    
+    Args:
+        args: 'output' path, 'text' to write, and optional 'append' flag
+    """
+    output = _output_path(args)
+    data = str(args.get('text', '')).encode('utf-8')
+    
+    if args.get('append'):
+        with open(output, 'ab') as f:
+            f.write(data)
+    else:
+        with _atomic_output(output) as f:
+            f.write(data)
+
+
+def op_cat(args: Dict[str, Any]):
+    """
+    Concatenate files.
+    
+    Args:
+        args: 'inputs' paths and 'output' path
+    """
+    inputs = _input_paths(args)
+    with _atomic_output(_output_path(args)) as out:
+        for path in inputs:
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, out)
+
+
+def op_dedup(args: Dict[str, Any]):
+    """
+    Merge the lines of files, keeping the first occurrence of each.
+    
+    Blank lines are dropped and the original order is kept.
+    
+    Args:
+        args: 'inputs' paths and 'output' path
+    """
+    inputs = _input_paths(args)
+    seen = set()
+    with _atomic_output(_output_path(args)) as out:
+        for line in _iter_lines(inputs):
+            if line and line not in seen:
+                seen.add(line)
+                out.write(line + b'\n')
+
+
+def op_grep(args: Dict[str, Any]):
+    """
+    Keep the lines of files that match a regular expression.
+    
+    Args:
+        args: 'inputs' paths, 'output' path, 'pattern' regex and optional
+            'invert' flag to keep non-matching lines instead
+    """
+    inputs = _input_paths(args)
+    if not args.get('pattern'):
+        raise ValueError("missing 'pattern'")
+    search = re.compile(str(args['pattern']).encode('utf-8')).search
+    invert = bool(args.get('invert'))
+    
+    with _atomic_output(_output_path(args)) as out:
+        for line in _iter_lines(inputs):
+            if (search(line) is None) == invert:
+                out.write(line + b'\n')
+
+
+# Op name -> implementation. Ops raise on failure and write nothing partial.
+BUILTIN_OPS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    "write": op_write,
+    "cat": op_cat,
+    "dedup": op_dedup,
+    "grep": op_grep,
+}
@@ -3,42 +3,95 @@ Command Line Interface for the bug bounty tool.
 Provides commands for initialization, execution, monitoring, and management.
 """
 
-import typer
+import argparse
+import inspect
 import shutil
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import Optional, List, Dict, Union
+from rich.text import Text
 import sys
 import time
 
 from .config import config
-from .summarizer import Summarizer
-from .telegram_bot import BugBountyBot
-from .notifier import get_notifier, create_notifier
 from .utils import (
-    read_json, print_status_table, print_panel, 
-    format_timestamp, format_duration, create_zip_archive,
-    file_lock, check_stop_flag, remove_stop_flag
+    console, read_json, print_status_table, print_panel, 
+    format_timestamp, format_duration, create_zip_archive, create_progress_bar,
+    file_lock, check_stop_flag, remove_stop_flag, parallel_rmtree
+)
+from .constants import (
+    TASKS_YAML, PROGRESS_JSON, REPORTS_DIR, STATUS_EMOJI, ZIP_EXCLUDE_PATTERNS
 )
-from .constants import TASKS_YAML
 
-app = typer.Typer(
-    name="bugbounty",
-    help="Bug Bounty Automation Tool by r0tbin",
-    no_args_is_help=True
+app = argparse.ArgumentParser(
+    prog="bugbounty",
+    description="Bug Bounty Automation Tool by r0tbin"
 )
+_commands = app.add_subparsers(dest="command", metavar="COMMAND")
+
+# Fallback tasks.yaml written by `init` when the sample template is missing
+BASIC_TASKS_YAML = """\
+version: 1
+concurrency: 2
+vars:
+  TARGET: "{target}"
+  ROOT: '{{ROOT}}'
+  OUT: '{{OUT}}'
+pipeline:
+  - name: example_task
+    desc: Example task - replace with your tools
+    cmd: 'echo "Target: {{TARGET}}" > {{OUT}}/outputs/example.txt'
+    timeout: 300
+"""
 
-console = Console()
 
+def _error(message: str):
+    """Print an error line; the message is not parsed for Rich markup."""
+    console.print(Text(message, style="red"))
 
-@app.command()
-def init(
-    target: str = typer.Argument(..., help="Target domain (e.g., example.com)"),
-    force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing target directory")
-):
+
+def _warning(message: str):
+    """Print a warning line; the message is not parsed for Rich markup."""
+    console.print(Text(message, style="yellow"))
+
+
+def _success(message: str):
+    """Print a success line; the message is not parsed for Rich markup."""
+    console.print(Text(message, style="green"))
+
+
+def argument(*flags: str, **kwargs):
+    """Describe a command-line argument for the `command` decorator."""
+    return flags, kwargs
+
+
+def command(*arguments, name: Optional[str] = None):
+    """
+    Register a function as a CLI subcommand.
+    
+    Argument dests must match the function's parameter names; the
+    docstring is used as the command help.
+    """
+    def decorator(func):
+        doc = inspect.cleandoc(func.__doc__ or "")
+        parser = _commands.add_parser(
+            name or func.__name__,
+            help=doc.splitlines()[0] if doc else None,
+            description=doc
+        )
+        for flags, kwargs in arguments:
+            parser.add_argument(*flags, **kwargs)
+        parser.set_defaults(_handler=func)
+        return func
+    return decorator
+
+
+@command(
+    argument("target", help="Target domain (e.g., example.com)"),
+    argument("--force", "-f", action="store_true", help="Overwrite existing target directory")
+)
+def init(target: str, force: bool = False):
     """
     Initialize a new target with directory structure and sample configuration.
     """
@@ -48,9 +101,9 @@ def init(
     
     # Check if target already exists
     if target_dir.exists() and not force:
-        console.print(f"[red]❌ Target directory already exists: {target_dir}[/red]")
+        _error(f"❌ Target directory already exists: {target_dir}")
         console.print("Use --force to overwrite")
-        raise typer.Exit(1)
+        raise SystemExit(1)
     
     try:
         # Create target structure
@@ -73,27 +126,7 @@ def init(
             console.print(f"🎯 Auto-configured TARGET: [bold cyan]{target}[/bold cyan]")
         else:
             # Create basic tasks.yaml
-            basic_tasks = {
-                'version': 1,
-                'concurrency': 2,
-                'vars': {
-                    'TARGET': target,
-                    'ROOT': '{ROOT}',
-                    'OUT': '{OUT}'
-                },
-                'pipeline': [
-                    {
-                        'name': 'example_task',
-                        'desc': 'Example task - replace with your tools',
-                        'cmd': 'echo "Target: {TARGET}" > {OUT}/outputs/example.txt',
-                        'timeout': 300
-                    }
-                ]
-            }
-            
-            import yaml
-            with open(tasks_file, 'w', encoding='utf-8') as f:
-                yaml.dump(basic_tasks, f, default_flow_style=False, indent=2)
+            tasks_file.write_text(BASIC_TASKS_YAML.format(target=target), encoding='utf-8')
             
             console.print(f"✅ Created basic tasks configuration")
         
@@ -105,17 +138,23 @@ def init(
         console.print(f"🏃 Run with: [bold]bb run {target}[/bold]")
         
     except Exception as e:
-        console.print(f"[red]❌ Failed to initialize target: {e}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Failed to initialize target: {e}")
+        raise SystemExit(1)
 
 
-@app.command()
+@command(
+    argument("target", help="Target to run"),
+    argument("--tasks", "-t", help="Comma-separated list of specific tasks to run"),
+    argument("--resume", "-r", action="store_true", help="Resume from previous run"),
+    argument("--no-telegram", action="store_true", help="Disable Telegram notifications"),
+    argument("--concurrency", "-c", type=int, help="Override concurrency setting")
+)
 def run(
-    target: str = typer.Argument(..., help="Target to run"),
-    tasks: Optional[str] = typer.Option(None, "--tasks", "-t", help="Comma-separated list of specific tasks to run"),
-    resume: bool = typer.Option(False, "--resume", "-r", help="Resume from previous run"),
-    no_telegram: bool = typer.Option(False, "--no-telegram", help="Disable Telegram notifications"),
-    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-c", help="Override concurrency setting")
+    target: str,
+    tasks: Optional[str] = None,
+    resume: bool = False,
+    no_telegram: bool = False,
+    concurrency: Optional[int] = None
 ):
     """
     Run the bug bounty pipeline for a target.
@@ -125,9 +164,9 @@ def run(
     target_dir = config.target_dir(target)
     
     if not target_dir.exists():
-        console.print(f"[red]❌ Target not found: {target}[/red]")
+        _error(f"❌ Target not found: {target}")
         console.print(f"Initialize with: [bold]bb init {target}[/bold]")
-        raise typer.Exit(1)
+        raise SystemExit(1)
     
     # Check for lock
     lock_file = config.lock_file_path(target)
@@ -141,32 +180,36 @@ def run(
             task_filter = None
             if tasks:
                 task_filter = [t.strip() for t in tasks.split(',')]
-                console.print(f"📋 Running specific tasks: {task_filter}")
+                console.print(f"📋 Running specific tasks: {task_filter}", markup=False)
             
-            # Setup notifier
+            # Setup notifier, probing the connection while the runner is set up
             notifier = None
+            probe = None
             if not no_telegram and config.is_telegram_configured():
+                from .notifier import get_notifier
                 notifier = get_notifier()
-                if notifier and not notifier.test_connection():
-                    console.print("[yellow]⚠️  Telegram connection failed, continuing without notifications[/yellow]")
-                    notifier = None
+                if notifier:
+                    probe_executor = ThreadPoolExecutor(max_workers=1)
+                    probe = probe_executor.submit(notifier.test_connection_cached)
+                    probe_executor.shutdown(wait=False)
             
             # Use improved runner with optional database
             from .runner import TaskRunner
+            from .summarizer import Summarizer
             
             # Create runner without database to avoid SQLite lock issues
             runner = TaskRunner(target, notifier, use_database=False)
             
+            if probe is not None and not probe.result():
+                _warning("⚠️  Telegram connection failed, continuing without notifications")
+                runner.notifier = None
+            
             if concurrency:
                 runner.concurrency = concurrency
                 console.print(f"🔧 Using concurrency: {concurrency}")
             
             # Run pipeline
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
+            with create_progress_bar(output=console) as progress:
                 task = progress.add_task("Running pipeline...", total=None)
                 
                 success = runner.run(resume=resume, task_filter=task_filter)
@@ -174,7 +217,7 @@ def run(
                 progress.update(task, description="Pipeline completed")
             
             if success:
-                console.print(f"[green]✅ Pipeline completed successfully for {target}[/green]")
+                _success(f"✅ Pipeline completed successfully for {target}")
                 
                 # Generate summary if not already done
                 try:
@@ -182,74 +225,71 @@ def run(
                     summarizer.generate_summary()
                     console.print("📊 Analysis summary generated")
                 except Exception as e:
-                    console.print(f"[yellow]⚠️  Summary generation failed: {e}[/yellow]")
+                    _warning(f"⚠️  Summary generation failed: {e}")
                 
             else:
-                console.print(f"[red]❌ Pipeline failed for {target}[/red]")
-                raise typer.Exit(1)
+                _error(f"❌ Pipeline failed for {target}")
+                raise SystemExit(1)
     
     except Exception as e:
-        console.print(f"[red]❌ Run failed: {e}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Run failed: {e}")
+        raise SystemExit(1)
 
 
-@app.command()
-def status(
-    target: str = typer.Argument(..., help="Target to check"),
-    detailed: bool = typer.Option(False, "--detailed", "-d", help="Show detailed task status")
-):
+@command(
+    argument("target", help="Target to check"),
+    argument("--detailed", "-d", action="store_true", help="Show detailed task status")
+)
+def status(target: str, detailed: bool = False):
     """
     Show current status and progress for a target.
     """
     target_dir = config.target_dir(target)
     
     if not target_dir.exists():
-        console.print(f"[red]❌ Target not found: {target}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Target not found: {target}")
+        raise SystemExit(1)
     
     try:
         # Read progress data
         progress_data = read_json(config.progress_json_path(target))
         
         if not progress_data:
-            console.print(f"[yellow]📊 No active run for {target}[/yellow]")
+            _warning(f"📊 No active run for {target}")
             return
         
         # Main status panel
-        status_text = progress_data.get('status', 'UNKNOWN')
-        status_emoji = {
-            'PENDING': '⏳',
-            'RUNNING': '🔄',
-            'DONE': '✅',
-            'ERROR': '❌',
-            'CANCELLED': '🛑'
-        }.get(status_text, '❓')
+        get = progress_data.get
+        status_text = get('status', 'UNKNOWN')
+        status_emoji = STATUS_EMOJI.get(status_text, '❓')
         
-        total = progress_data.get('total', 0)
-        done = progress_data.get('done', 0)
+        total = get('total', 0)
+        done = get('done', 0)
+        current_task = get('current_task')
+        eta_seconds = get('eta_seconds')
+        started = get('started')
         
-        status_content = f"Status: {status_emoji} {status_text}\n"
+        lines = [f"Status: {status_emoji} {status_text}"]
         
         if total > 0:
             percentage = (done / total) * 100
-            progress_bar = "█" * int(percentage / 10) + "░" * (10 - int(percentage / 10))
-            status_content += f"Progress: [{progress_bar}] {percentage:.1f}%\n"
-            status_content += f"Tasks: {done}/{total}\n"
+            filled = int(percentage) // 10
+            lines.append(f"Progress: [{'█' * filled}{'░' * (10 - filled)}] {percentage:.1f}%")
+            lines.append(f"Tasks: {done}/{total}")
         
-        current_task = progress_data.get('current_task')
         if current_task:
-            status_content += f"Current: {current_task}\n"
+            lines.append(f"Current: {current_task}")
         
-        eta_seconds = progress_data.get('eta_seconds')
         if eta_seconds:
-            eta_str = format_duration(eta_seconds)
-            status_content += f"ETA: {eta_str}\n"
+            lines.append(f"ETA: {format_duration(eta_seconds)}")
         
-        started = progress_data.get('started')
         if started:
-            status_content += f"Started: {format_timestamp(started)}\n"
+            lines.append(f"Started: {format_timestamp(started)}")
         
-        print_panel(status_content, title=f"🎯 {target} Status", style="blue")
+        status_content = "\n".join(lines) + "\n"
+        
+        # Progress data is untrusted text; render it without markup parsing
+        print_panel(Text(status_content), title=f"🎯 {target} Status", style="blue")
         
         # Detailed task status (simple log-based)
         if detailed:
@@ -261,43 +301,40 @@ def status(
                         console.print(f"\n📋 Found {len(log_files)} task logs:")
                         for log_file in sorted(log_files):
                             task_name = log_file.stem
-                            console.print(f"  • {task_name}: {log_file}")
+                            console.print(f"  • {task_name}: {log_file}", markup=False)
                     else:
                         console.print("\n📋 No detailed task logs found")
                 else:
                     console.print("\n📋 No task logs directory found")
             except Exception as e:
-                console.print(f"[yellow]⚠️ Could not read detailed logs: {e}[/yellow]")
+                _warning(f"⚠️ Could not read detailed logs: {e}")
     
     except Exception as e:
-        console.print(f"[red]❌ Error getting status: {e}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Error getting status: {e}")
+        raise SystemExit(1)
 
 
-@app.command()
-def summarize(
-    target: str = typer.Argument(..., help="Target to summarize"),
-    regenerate: bool = typer.Option(False, "--regenerate", "-r", help="Regenerate summary even if it exists")
-):
+@command(
+    argument("target", help="Target to summarize"),
+    argument("--regenerate", "-r", action="store_true", help="Regenerate summary even if it exists")
+)
+def summarize(target: str, regenerate: bool = False):
     """
     Generate analysis summary and reports for a target.
     """
     target_dir = config.target_dir(target)
     
     if not target_dir.exists():
-        console.print(f"[red]❌ Target not found: {target}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Target not found: {target}")
+        raise SystemExit(1)
     
     try:
         console.print(f"📊 Generating summary for: [bold cyan]{target}[/bold cyan]")
         
+        from .summarizer import Summarizer
         summarizer = Summarizer(target)
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
+        with create_progress_bar(output=console) as progress:
             task = progress.add_task("Analyzing results...", total=None)
             
             summary_data = summarizer.generate_summary()
@@ -320,39 +357,44 @@ def summarize(
         
         # Show report files
         reports_dir = config.reports_dir(target)
-        report_files = []
         
-        for file_path in reports_dir.glob("*"):
-            if file_path.is_file():
-                size_mb = file_path.stat().st_size / (1024 * 1024)
-                report_files.append({
-                    'File': file_path.name,
-                    'Size (MB)': f"{size_mb:.2f}"
-                })
+        # DirEntry reuses the d_type from readdir and caches its stat()
+        try:
+            with os.scandir(reports_dir) as it:
+                report_files = [
+                    {
+                        'File': entry.name,
+                        'Size (MB)': f"{entry.stat().st_size / 1048576:.2f}"
+                    }
+                    for entry in it if entry.is_file()
+                ]
+        except FileNotFoundError:
+            report_files = []
         
         if report_files:
             print_status_table(report_files, "Generated Reports")
         
-        console.print(f"[green]✅ Summary generated in {reports_dir}[/green]")
+        _success(f"✅ Summary generated in {reports_dir}")
     
     except Exception as e:
-        console.print(f"[red]❌ Error generating summary: {e}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Error generating summary: {e}")
+        raise SystemExit(1)
 
 
-@app.command()
-def zip(
-    target: str = typer.Argument(..., help="Target to archive"),
-    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output ZIP file path")
-):
+@command(
+    argument("target", help="Target to archive"),
+    argument("--output", "-o", help="Output ZIP file path"),
+    name="zip"
+)
+def zip_target(target: str, output: Optional[str] = None):
     """
     Create a ZIP archive with results for a target.
     """
     target_dir = config.target_dir(target)
     
     if not target_dir.exists():
-        console.print(f"[red]❌ Target not found: {target}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Target not found: {target}")
+        raise SystemExit(1)
     
     try:
         if output:
@@ -362,120 +404,124 @@ def zip(
         
         console.print(f"📦 Creating ZIP archive: [cyan]{zip_path}[/cyan]")
         
-        # Exclude patterns
-        exclude_patterns = [
-            "*.tmp",
-            "*.lock",
-            "__pycache__/**",
-            ".stop"
-        ]
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
+        with create_progress_bar(output=console) as progress:
             task = progress.add_task("Creating archive...", total=None)
             
-            create_zip_archive(target_dir, zip_path, exclude_patterns)
+            create_zip_archive(target_dir, zip_path, ZIP_EXCLUDE_PATTERNS)
             
             progress.update(task, description="Archive created")
         
-        size_mb = zip_path.stat().st_size / (1024 * 1024)
-        console.print(f"[green]✅ ZIP created: {zip_path} ({size_mb:.2f} MB)[/green]")
+        size_mb = zip_path.stat().st_size / 1048576
+        _success(f"✅ ZIP created: {zip_path} ({size_mb:.2f} MB)")
     
     except Exception as e:
-        console.print(f"[red]❌ Error creating ZIP: {e}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Error creating ZIP: {e}")
+        raise SystemExit(1)
 
 
-@app.command()
+@command()
 def bot():
     """
     Start the Telegram bot server for remote monitoring.
     """
     if not config.is_telegram_configured():
-        console.print("[red]❌ Telegram not configured[/red]")
+        _error("❌ Telegram not configured")
         console.print("Please set BOT_TOKEN and CHAT_ID in .env file")
-        raise typer.Exit(1)
+        raise SystemExit(1)
     
     try:
         console.print("🤖 Starting Telegram bot...")
         console.print(f"Chat ID: [cyan]{config.CHAT_ID}[/cyan]")
         console.print("Press [bold red]Ctrl+C[/bold red] to stop")
         
+        from .telegram_bot import BugBountyBot
+        
         bot = BugBountyBot()
         bot.run_sync()
     
     except KeyboardInterrupt:
-        console.print("\n[yellow]👋 Bot stopped[/yellow]")
+        _warning("\n👋 Bot stopped")
     except Exception as e:
-        console.print(f"[red]❌ Bot failed: {e}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Bot failed: {e}")
+        raise SystemExit(1)
+
+
+def _has_entries(directory: Union[str, Path]) -> bool:
+    """Check if a directory contains at least one entry."""
+    try:
+        with os.scandir(directory) as it:
+            return next(it, None) is not None
+    except OSError:
+        return False
+
+
+def _target_row(entry: os.DirEntry) -> Dict[str, str]:
+    """Build the `list` table row for a single target directory."""
+    # Plain string joins; no Path objects are needed for these lookups
+    progress_data = read_json(os.path.join(entry.path, PROGRESS_JSON))
+    status = "Inactive"
+    
+    if progress_data:
+        status = progress_data.get('status', 'Unknown')
+    
+    # Check if there are results
+    has_results = "Yes" if _has_entries(os.path.join(entry.path, REPORTS_DIR)) else "No"
+    
+    return {
+        'Target': entry.name,
+        'Status': status,
+        'Has Results': has_results
+    }
 
 
-@app.command()
-def list():
+@command(name="list")
+def list_targets():
     """
     List all available targets.
     """
     work_dir = config.work_dir_path
     
-    if not work_dir.exists():
-        console.print("[yellow]📂 No targets found[/yellow]")
-        return
-    
-    targets = [d.name for d in work_dir.iterdir() if d.is_dir()]
+    try:
+        # DirEntry.is_dir() reuses the d_type from readdir
+        with os.scandir(work_dir) as it:
+            targets = sorted(
+                (entry for entry in it if entry.is_dir()),
+                key=lambda entry: entry.name
+            )
+    except FileNotFoundError:
+        targets = []
     
     if not targets:
-        console.print("[yellow]📂 No targets found[/yellow]")
+        _warning("📂 No targets found")
         return
     
-    target_data = []
-    
-    for target in sorted(targets):
-        # Check status
-        progress_data = read_json(config.progress_json_path(target))
-        status = "Inactive"
-        
-        if progress_data:
-            status = progress_data.get('status', 'Unknown')
-        
-        # Check if there are results
-        reports_dir = config.reports_dir(target)
-        has_results = "No"
-        if reports_dir.exists() and any(reports_dir.glob("*")):
-            has_results = "Yes"
-        
-        target_data.append({
-            'Target': target,
-            'Status': status,
-            'Has Results': has_results
-        })
+    # Per-target reads are small and independent, so overlap them
+    with ThreadPoolExecutor(max_workers=min(32, len(targets))) as executor:
+        target_data = list(executor.map(_target_row, targets))
     
     print_status_table(target_data, "Available Targets")
 
 
-@app.command()
-def clean(
-    target: str = typer.Argument(..., help="Target to clean"),
-    logs: bool = typer.Option(False, "--logs", help="Clean log files"),
-    outputs: bool = typer.Option(False, "--outputs", help="Clean output files"),
-    reports: bool = typer.Option(False, "--reports", help="Clean report files"),
-    all: bool = typer.Option(False, "--all", help="Clean everything")
-):
+@command(
+    argument("target", help="Target to clean"),
+    argument("--logs", action="store_true", help="Clean log files"),
+    argument("--outputs", action="store_true", help="Clean output files"),
+    argument("--reports", action="store_true", help="Clean report files"),
+    argument("--all", action="store_true", help="Clean everything")
+)
+def clean(target: str, logs: bool = False, outputs: bool = False, reports: bool = False, all: bool = False):
     """
     Clean files for a target.
     """
     target_dir = config.target_dir(target)
     
     if not target_dir.exists():
-        console.print(f"[red]❌ Target not found: {target}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Target not found: {target}")
+        raise SystemExit(1)
     
     if not any([logs, outputs, reports, all]):
-        console.print("[red]❌ Please specify what to clean (--logs, --outputs, --reports, or --all)[/red]")
-        raise typer.Exit(1)
+        _error("❌ Please specify what to clean (--logs, --outputs, --reports, or --all)")
+        raise SystemExit(1)
     
     try:
         cleaned = []
@@ -483,37 +529,45 @@ def clean(
         if logs or all:
             logs_dir = config.logs_dir(target)
             if logs_dir.exists():
-                shutil.rmtree(logs_dir)
+                parallel_rmtree(logs_dir)
                 logs_dir.mkdir()
                 cleaned.append("logs")
         
         if outputs or all:
             outputs_dir = config.outputs_dir(target)
             if outputs_dir.exists():
-                shutil.rmtree(outputs_dir)
+                parallel_rmtree(outputs_dir)
                 config.ensure_target_structure(target)  # Recreate structure
                 cleaned.append("outputs")
         
         if reports or all:
             reports_dir = config.reports_dir(target)
             if reports_dir.exists():
-                shutil.rmtree(reports_dir)
+                parallel_rmtree(reports_dir)
                 reports_dir.mkdir()
                 cleaned.append("reports")
         
         if cleaned:
-            console.print(f"[green]✅ Cleaned {', '.join(cleaned)} for {target}[/green]")
+            _success(f"✅ Cleaned {', '.join(cleaned)} for {target}")
         else:
-            console.print("[yellow]⚠️  Nothing to clean[/yellow]")
+            _warning("⚠️  Nothing to clean")
     
     except Exception as e:
-        console.print(f"[red]❌ Error cleaning: {e}[/red]")
-        raise typer.Exit(1)
+        _error(f"❌ Error cleaning: {e}")
+        raise SystemExit(1)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
-    app()
+    args = vars(app.parse_args(argv))
+    args.pop("command")
+    handler = args.pop("_handler", None)
+    
+    if handler is None:
+        app.print_help()
+        return
+    
+    handler(**args)
 
 
 if __name__ == "__main__":
@@ -4,9 +4,10 @@ Handles environment variables, paths, and global settings.
 """
 
 import os
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Optional, Dict
 
 from .constants import (
     DEFAULT_CONCURRENCY,
@@ -15,16 +16,133 @@ from .constants import (
     LOGS_DIR,
     OUTPUTS_DIR,
     REPORTS_DIR,
-    TMP_DIR
+    TMP_DIR,
+    TASKS_YAML,
+    TASKS_CACHE,
+    PROGRESS_JSON,
+    RUN_DB,
+    LOCK_FILE,
+    STOP_FLAG,
+    RUNNER_LOG,
+    TASKS_LOG_DIR,
+    OUTPUT_SUBDIRS
 )
 
 
+def _find_env_file(filename: str = ".env") -> Optional[Path]:
+    """Search for an env file from the package directory up to the filesystem root."""
+    start = Path(__file__).resolve().parent
+    for directory in (start, *start.parents):
+        candidate = directory / filename
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load_env_file(env_path: Optional[Path] = None):
+    """
+    Load KEY=VALUE pairs from a .env file into os.environ.
+    
+    Existing environment variables are never overridden. Supports comments,
+    an optional `export` prefix and single/double quoted values.
+    
+    Args:
+        env_path: Path to the env file (searched for if omitted)
+    """
+    if env_path is None:
+        env_path = _find_env_file()
+        if env_path is None:
+            return
+    
+    try:
+        lines = env_path.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return
+    
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('export '):
+            line = line[7:].lstrip()
+        
+        key, sep, value = line.partition('=')
+        key = key.strip()
+        if not sep or not key:
+            continue
+        
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+            value = value[1:-1]
+        elif ' #' in value:
+            # Inline comment on an unquoted value
+            value = value.split(' #', 1)[0].rstrip()
+        
+        os.environ.setdefault(key, value)
+
+
+@dataclass(frozen=True)
+class TargetPaths:
+    """Resolved filesystem layout for a single target."""
+    
+    target: str
+    target_dir: Path
+    
+    @cached_property
+    def logs_dir(self) -> Path:
+        return self.target_dir / LOGS_DIR
+    
+    @cached_property
+    def task_logs_dir(self) -> Path:
+        return self.logs_dir / TASKS_LOG_DIR
+    
+    @cached_property
+    def outputs_dir(self) -> Path:
+        return self.target_dir / OUTPUTS_DIR
+    
+    @cached_property
+    def reports_dir(self) -> Path:
+        return self.target_dir / REPORTS_DIR
+    
+    @cached_property
+    def tmp_dir(self) -> Path:
+        return self.target_dir / TMP_DIR
+    
+    @cached_property
+    def tasks_yaml(self) -> Path:
+        return self.target_dir / TASKS_YAML
+    
+    @cached_property
+    def tasks_cache(self) -> Path:
+        return self.target_dir / TASKS_CACHE
+    
+    @cached_property
+    def progress_json(self) -> Path:
+        return self.target_dir / PROGRESS_JSON
+    
+    @cached_property
+    def run_db(self) -> Path:
+        return self.target_dir / RUN_DB
+    
+    @cached_property
+    def lock_file(self) -> Path:
+        return self.target_dir / LOCK_FILE
+    
+    @cached_property
+    def stop_flag(self) -> Path:
+        return self.target_dir / STOP_FLAG
+    
+    @cached_property
+    def runner_log(self) -> Path:
+        return self.logs_dir / RUNNER_LOG
+
+
 class Config:
     """Global configuration manager."""
     
     def __init__(self):
         # Load environment variables
-        load_dotenv()
+        load_env_file()
         
         # Telegram configuration
         self.BOT_TOKEN = os.getenv("BOT_TOKEN")
@@ -43,6 +161,9 @@ class Config:
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
         self.MAX_LOG_SIZE = os.getenv("MAX_LOG_SIZE", "50MB")
         
+        # Resolved per-target paths, see for_target()
+        self._target_paths: Dict[str, TargetPaths] = {}
+        
         # Validate required configuration
         self._validate()
     
@@ -51,75 +172,91 @@ class Config:
         if not self.ROOT_DIR.exists():
             raise ValueError(f"Root directory does not exist: {self.ROOT_DIR}")
     
+    @property
+    def cache_dir(self) -> Path:
+        """Get the per-user cache directory."""
+        base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+        return Path(base) / "bugbounty"
+    
     @property
     def work_dir_path(self) -> Path:
         """Get the work directory path."""
         return self.ROOT_DIR / self.WORK_DIR
     
+    def for_target(self, target: str) -> TargetPaths:
+        """Get the cached path layout for a target."""
+        paths = self._target_paths.get(target)
+        if paths is None:
+            paths = TargetPaths(target, self.work_dir_path / target)
+            self._target_paths[target] = paths
+        return paths
+    
     def target_dir(self, target: str) -> Path:
         """Get the target directory path."""
-        return self.work_dir_path / target
+        return self.for_target(target).target_dir
     
     def logs_dir(self, target: str) -> Path:
         """Get the logs directory for a target."""
-        return self.target_dir(target) / LOGS_DIR
+        return self.for_target(target).logs_dir
     
     def outputs_dir(self, target: str) -> Path:
         """Get the outputs directory for a target."""
-        return self.target_dir(target) / OUTPUTS_DIR
+        return self.for_target(target).outputs_dir
     
     def reports_dir(self, target: str) -> Path:
         """Get the reports directory for a target."""
-        return self.target_dir(target) / REPORTS_DIR
+        return self.for_target(target).reports_dir
     
     def tmp_dir(self, target: str) -> Path:
         """Get the tmp directory for a target."""
-        return self.target_dir(target) / TMP_DIR
+        return self.for_target(target).tmp_dir
     
     def tasks_yaml_path(self, target: str) -> Path:
         """Get the tasks.yaml file path for a target."""
-        return self.target_dir(target) / "tasks.yaml"
+        return self.for_target(target).tasks_yaml
+    
+    def tasks_cache_path(self, target: str) -> Path:
+        """Get the parsed tasks.yaml cache file path for a target."""
+        return self.for_target(target).tasks_cache
     
     def progress_json_path(self, target: str) -> Path:
         """Get the progress.json file path for a target."""
-        return self.target_dir(target) / "progress.json"
+        return self.for_target(target).progress_json
     
     def run_db_path(self, target: str) -> Path:
         """Get the run database path for a target."""
-        return self.target_dir(target) / "run.db"
+        return self.for_target(target).run_db
     
     def lock_file_path(self, target: str) -> Path:
         """Get the lock file path for a target."""
-        return self.target_dir(target) / ".lock"
+        return self.for_target(target).lock_file
     
     def stop_flag_path(self, target: str) -> Path:
         """Get the stop flag file path for a target."""
-        return self.target_dir(target) / ".stop"
+        return self.for_target(target).stop_flag
     
     def runner_log_path(self, target: str) -> Path:
         """Get the runner log file path for a target."""
-        return self.logs_dir(target) / "runner.log"
+        return self.for_target(target).runner_log
     
     def task_log_path(self, target: str, task_number: int, task_name: str) -> Path:
         """Get the task log file path for a specific task."""
-        return self.logs_dir(target) / "tareas" / f"{task_number:02d}_{task_name}.log"
+        return self.for_target(target).task_logs_dir / f"{task_number:02d}_{task_name}.log"
     
     def ensure_target_structure(self, target: str):
         """Ensure target directory structure exists."""
-        target_path = self.target_dir(target)
+        paths = self.for_target(target)
         
-        # Create main directories
-        target_path.mkdir(parents=True, exist_ok=True)
-        self.logs_dir(target).mkdir(exist_ok=True)
-        (self.logs_dir(target) / "tareas").mkdir(exist_ok=True)
-        self.outputs_dir(target).mkdir(exist_ok=True)
-        self.reports_dir(target).mkdir(exist_ok=True)
-        self.tmp_dir(target).mkdir(exist_ok=True)
+        dirs = [
+            paths.task_logs_dir,
+            paths.reports_dir,
+            paths.tmp_dir,
+        ]
+        dirs.extend(paths.outputs_dir / subdir for subdir in OUTPUT_SUBDIRS)
         
-        # Create output subdirectories
-        output_subdirs = ["recon", "web", "endpoints", "scans", "artifacts"]
-        for subdir in output_subdirs:
-            (self.outputs_dir(target) / subdir).mkdir(exist_ok=True)
+        # Leaf directories only; parents=True creates the shared prefixes
+        for directory in dirs:
+            directory.mkdir(parents=True, exist_ok=True)
     
     def is_telegram_configured(self) -> bool:
         """Check if Telegram is properly configured."""
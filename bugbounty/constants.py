@@ -36,17 +36,30 @@ class EventLevel(Enum):
 class TaskKind(Enum):
     """Task execution types."""
     SHELL = "shell"
+    PIPE = "pipe"
     INTERNAL_SUMMARIZE = "internal:summarize"
     INTERNAL_NOTIFY = "internal:notify"
 
 
+# Status display
+STATUS_EMOJI = {
+    RunStatus.PENDING.value: "⏳",
+    RunStatus.RUNNING.value: "🔄",
+    RunStatus.DONE.value: "✅",
+    RunStatus.ERROR.value: "❌",
+    RunStatus.CANCELLED.value: "🛑"
+}
+
 # Default configuration values
 DEFAULT_CONCURRENCY = 2
 DEFAULT_TIMEOUT = 3600  # 1 hour
 DEFAULT_HARD_KILL_GRACE = 10  # seconds
+STOP_FLAG_POLL_INTERVAL = 1.0  # seconds between stop flag stat() calls without inotify
 
 # File and directory names
 TASKS_YAML = "tasks.yaml"
+TASKS_CACHE = ".tasks.cache.pkl"
+FILTERS_CACHE = ".juicy_filters.cache.pkl"
 PROGRESS_JSON = "progress.json"
 RUN_DB = "run.db"
 LOGS_DIR = "logs"
@@ -54,6 +67,9 @@ OUTPUTS_DIR = "outputs"
 REPORTS_DIR = "reports"
 TMP_DIR = "tmp"
 
+# Output subdirectories created for every target
+OUTPUT_SUBDIRS = ["recon", "web", "endpoints", "scans", "artifacts"]
+
 # Log file names
 RUNNER_LOG = "runner.log"
 TASKS_LOG_DIR = "tareas"
@@ -67,6 +83,15 @@ RESULTS_ZIP = "results.zip"
 LOCK_FILE = ".lock"
 STOP_FLAG = ".stop"
 
+# Files left out of target archives (`bb zip` and the summary's results.zip)
+ZIP_EXCLUDE_PATTERNS = [
+    "*.tmp",
+    "*.lock",
+    TASKS_CACHE,
+    "__pycache__/**",
+    STOP_FLAG
+]
+
 # Template variables
 TEMPLATE_VARS = {
     "TARGET": "{TARGET}",
@@ -5,32 +5,157 @@ Handles SQLite database schema, connections, and operations.
 
 import sqlite3
 import json
-from datetime import datetime, timezone
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from contextlib import contextmanager
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    # orjson is optional, fall back to the stdlib encoder
+    HAS_ORJSON = False
+
 from .constants import TaskStatus, RunStatus, EventLevel
 
 
+# RETURNING needs SQLite 3.35+; older libraries fall back to cursor.lastrowid
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RETURNING_ID = " RETURNING id" if HAS_RETURNING else ""
+
+# Statement texts are module constants so every call hits the connection's
+# prepared-statement cache with the exact same SQL string
+SQL_INSERT_RUN = (
+    "INSERT INTO runs (target, start_ts, status, total_tasks, metadata) VALUES (?, ?, ?, ?, ?)"
+    + _RETURNING_ID
+)
+SQL_END_RUN = "UPDATE runs SET end_ts = ?, status = ? WHERE id = ?"
+SQL_END_RUN_WITH_METADATA = "UPDATE runs SET end_ts = ?, status = ?, metadata = ? WHERE id = ?"
+SQL_INCREMENT_COMPLETED = "UPDATE runs SET completed_tasks = completed_tasks + 1 WHERE id = ?"
+SQL_INSERT_TASK = (
+    "INSERT INTO tasks (run_id, name, description, start_ts, status, cmd, timeout, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    + _RETURNING_ID
+)
+SQL_END_TASK = (
+    "UPDATE tasks SET end_ts = ?, status = ?, "
+    "return_code = COALESCE(?, return_code), "
+    "stdout_path = COALESCE(?, stdout_path), "
+    "stderr_path = COALESCE(?, stderr_path), "
+    "metadata = COALESCE(?, metadata) "
+    "WHERE id = ?"
+)
+SQL_END_TASK_RETURNING_OWNER = SQL_END_TASK + " RETURNING run_id, name"
+SQL_SELECT_TASK_OWNER = "SELECT run_id, name FROM tasks WHERE id = ?"
+SQL_INSERT_EVENT = (
+    "INSERT INTO events (run_id, task_name, ts, level, message, metadata) VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_SELECT_RUN = "SELECT * FROM runs WHERE id = ?"
+SQL_SELECT_LATEST_RUN = "SELECT * FROM runs WHERE target = ? ORDER BY start_ts DESC LIMIT 1"
+SQL_SELECT_RUN_TASKS = "SELECT * FROM tasks WHERE run_id = ? ORDER BY id"
+SQL_SELECT_RUN_EVENTS = (
+    "SELECT * FROM events WHERE run_id = ? ORDER BY ts DESC, id DESC LIMIT ?"
+)
+SQL_SELECT_RUN_EVENTS_BEFORE = (
+    "SELECT * FROM events WHERE run_id = ? AND (ts < ? OR (ts = ? AND id < ?)) "
+    "ORDER BY ts DESC, id DESC LIMIT ?"
+)
+SQL_SELECT_TASK_BY_NAME = "SELECT * FROM tasks WHERE run_id = ? AND name = ?"
+
+# Per-connection prepared-statement cache size (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Buffered events are written once this many are pending
+EVENT_BUFFER_SIZE = 128
+
+# Most write operations the writer thread commits in one transaction
+WRITE_BATCH_SIZE = 64
+
+# Seconds a connection waits on another process's lock before giving up
+BUSY_TIMEOUT = 30.0
+
+
+# Stored value of an empty metadata column
+_EMPTY_JSON = "{}"
+_json_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _dump_metadata(metadata: Optional[Dict[str, Any]]) -> str:
+    """Serialize a metadata dict for storage."""
+    if not metadata:
+        return _EMPTY_JSON
+    if HAS_ORJSON:
+        # Accept non-str keys like json.dumps does
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return _json_encode(metadata)
+
+
+def _fetch_dict(cursor: sqlite3.Cursor) -> Optional[Dict[str, Any]]:
+    """Get the next row of a cursor as a dict."""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """Get the remaining rows of a cursor as dicts."""
+    # Plain tuples with the column names resolved once per query are
+    # cheaper than sqlite3.Row (or a row_factory) plus dict() per row
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") for _now_iso()
+_ts_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string with microsecond precision.
+    
+    Same format as datetime.isoformat() on an aware UTC datetime, so new
+    rows sort correctly as text against ones written that way.
+    """
+    global _ts_cache
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached = _ts_cache
+    if cached[0] != second:
+        # Only re-format the date/time part when the second rolls over
+        cached = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+        _ts_cache = cached
+    return f"{cached[1]}.{nanos // 1000:06d}+00:00"
+
+
 class Database:
     """SQLite database manager for runs, tasks, and events."""
     
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        # One long-lived connection per thread, see get_connection()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Pending event rows, written in batches by _write_events()
+        self._event_buf: List[Tuple] = []
+        self._event_lock = threading.Lock()
+        # Background writer, see _submit_write()
+        self._write_queue: "queue.Queue[Optional[Tuple[Future, Callable, Tuple]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
         self.init_db()
     
     def init_db(self):
         """Initialize database tables if they don't exist."""
-        # Set SQLite to single-threaded mode to avoid locks
-        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        # Critical: Set to DELETE journal mode before any operations
-        conn.execute("PRAGMA journal_mode=DELETE")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA temp_store=MEMORY")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA locking_mode=NORMAL")
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        # WAL is persistent in the database file, so readers (status queries)
+        # stop blocking the runner's writes from here on
+        conn.execute("PRAGMA journal_mode=WAL")
+        self._configure_connection(conn)
         
         conn.executescript("""
                 CREATE TABLE IF NOT EXISTS runs (
@@ -73,197 +198,375 @@ class Database:
                 );
                 
                 CREATE INDEX IF NOT EXISTS idx_runs_target ON runs(target);
-                CREATE INDEX IF NOT EXISTS idx_tasks_run_id ON tasks(run_id);
-                CREATE INDEX IF NOT EXISTS idx_events_run_id ON events(run_id);
-                CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+                CREATE INDEX IF NOT EXISTS idx_tasks_run_name ON tasks(run_id, name);
+                CREATE INDEX IF NOT EXISTS idx_events_run_ts ON events(run_id, ts DESC);
+                
+                -- Superseded by the composite indexes above
+                DROP INDEX IF EXISTS idx_tasks_run_id;
+                DROP INDEX IF EXISTS idx_events_run_id;
+                DROP INDEX IF EXISTS idx_events_ts;
             """)
         conn.commit()
         conn.close()
     
-    @contextmanager
-    def get_connection(self):
-        """Get a database connection with automatic commit/rollback."""
-        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        # Configure SQLite to avoid locks
-        conn.execute("PRAGMA journal_mode=DELETE")
-        conn.execute("PRAGMA synchronous=NORMAL") 
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """Apply connection-scoped PRAGMAs."""
+        # With WAL, NORMAL only syncs on checkpoint instead of every commit
+        conn.execute("PRAGMA synchronous=NORMAL")
         conn.execute("PRAGMA temp_store=MEMORY")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA locking_mode=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        # Checkpoint less often than the default 1000 pages so bursts of
+        # small commits don't stall on it
+        conn.execute("PRAGMA wal_autocheckpoint=10000")
+    
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are managed by get_connection()
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                   isolation_level=None,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            self._configure_connection(conn)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def get_connection(self, write: bool = True):
+        """
+        Get this thread's database connection inside a transaction.
+        
+        Write transactions are only opened by the writer thread (see
+        _submit_write()), so they never contend with each other in-process.
+        They take SQLite's write lock up front (BEGIN IMMEDIATE) and are
+        committed on success or rolled back on error. Nested calls join the
+        enclosing transaction. Read-only callers pass write=False and run in
+        autocommit mode so they never wait on writes.
+        """
+        conn = self._thread_connection()
+        if not write or conn.in_transaction:
+            yield conn
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
         try:
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
+        except BaseException:
+            conn.execute("ROLLBACK")
             raise
-        finally:
+        conn.execute("COMMIT")
+    
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, sql: str, params: Tuple) -> int:
+        """Execute an INSERT built with _RETURNING_ID and return the new row ID."""
+        if HAS_RETURNING:
+            return conn.execute(sql, params).fetchone()[0]
+        return conn.execute(sql, params).lastrowid
+    
+    def _write_events(self, conn: sqlite3.Connection):
+        """Insert all buffered events using the caller's transaction."""
+        with self._event_lock:
+            rows, self._event_buf = self._event_buf, []
+        if rows:
+            conn.executemany(SQL_INSERT_EVENT, rows)
+    
+    def _submit_write(self, func: Callable, *args) -> Future:
+        """
+        Queue a write operation for the background writer thread.
+        
+        The writer commits whatever operations are queued, up to
+        WRITE_BATCH_SIZE, in a single transaction, so concurrent callers share
+        one commit instead of taking turns on SQLite's write lock. Operations run
+        in submission order, each in its own savepoint so a failing one
+        doesn't roll back the rest of the batch.
+        
+        Args:
+            func: Called as func(conn, *args) inside the write transaction
+            *args: Arguments for func
+        
+        Returns:
+            Future resolved with func's result once the batch is committed
+        """
+        future: Future = Future()
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop,
+                                                name="db-writer", daemon=True)
+                self._writer.start()
+            self._write_queue.put((future, func, args))
+        return future
+    
+    def _writer_loop(self):
+        """Commit queued write operations in batches until a None sentinel arrives."""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            ops = [op for op in batch if op is not None]
+            if ops:
+                self._commit_batch(ops)
+            if len(ops) < len(batch):
+                return
+    
+    def _commit_batch(self, ops: List[Tuple[Future, Callable, Tuple]]):
+        """Run a batch of write operations in one transaction and resolve their futures."""
+        # Claim every future before opening the transaction, so a failure to
+        # open it can fail them all instead of leaving some pending
+        ops = [op for op in ops if op[0].set_running_or_notify_cancel()]
+        outcomes = []
+        try:
+            with self.get_connection() as conn:
+                for future, func, args in ops:
+                    conn.execute("SAVEPOINT write_op")
+                    try:
+                        result = func(conn, *args)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write_op")
+                        conn.execute("RELEASE write_op")
+                        outcomes.append((future, e, None))
+                    else:
+                        conn.execute("RELEASE write_op")
+                        outcomes.append((future, None, result))
+                
+                # Events logged outside a transaction ride along with the batch
+                self._write_events(conn)
+        except Exception as e:
+            # The commit itself failed, so nothing in the batch was written
+            for future, _, _ in ops:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for future, error, result in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+    
+    def _stop_writer(self):
+        """Let the writer thread commit everything queued, then stop it."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is None:
+                return
+            self._write_queue.put(None)
+        writer.join()
+    
+    def flush_events(self):
+        """Write any buffered events and wait for queued writes to be committed."""
+        if self._writer is None and not self._event_buf:
+            return
+        self._submit_write(self._write_events).result()
+    
+    def close(self):
+        """
+        Flush pending writes and close every connection opened by this instance.
+        
+        The WAL is checkpointed and truncated first so it doesn't linger on
+        disk between runs.
+        """
+        self.flush_events()
+        self._stop_writer()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        if connections:
+            try:
+                connections[0].execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                # Another process is still using the database
+                pass
+        for conn in connections:
             conn.close()
+        self._local = threading.local()
     
     def start_run(self, target: str, total_tasks: int = 0, metadata: Dict[str, Any] = None) -> int:
         """Start a new run and return the run ID."""
-        now = datetime.now(timezone.utc).isoformat()
-        metadata = metadata or {}
+        now = _now_iso()
+        return self._submit_write(self._start_run, target, total_tasks, metadata, now).result()
+    
+    def _start_run(self, conn: sqlite3.Connection, target: str, total_tasks: int,
+                   metadata: Optional[Dict[str, Any]], now: str) -> int:
+        run_id = self._insert(
+            conn, SQL_INSERT_RUN,
+            (target, now, RunStatus.RUNNING.value, total_tasks, _dump_metadata(metadata))
+        )
         
-        with self.get_connection() as conn:
-            cursor = conn.execute(
-                "INSERT INTO runs (target, start_ts, status, total_tasks, metadata) VALUES (?, ?, ?, ?, ?)",
-                (target, now, RunStatus.RUNNING.value, total_tasks, json.dumps(metadata))
-            )
-            run_id = cursor.lastrowid
-            
-            # Log run start event
-            self.log_event(run_id, None, EventLevel.INFO, f"Run started for target: {target}")
-            
-            return run_id
+        # Log run start event
+        self.log_event(run_id, None, EventLevel.INFO, f"Run started for target: {target}",
+                       conn=conn)
+        
+        return run_id
     
     def end_run(self, run_id: int, status: RunStatus, metadata: Dict[str, Any] = None):
-        """End a run with the given status."""
-        now = datetime.now(timezone.utc).isoformat()
+        """End a run with the given status, after all queued task updates."""
+        now = _now_iso()
+        self._submit_write(self._end_run, run_id, status, metadata, now).result()
         
-        with self.get_connection() as conn:
-            # Update run
-            if metadata:
-                conn.execute(
-                    "UPDATE runs SET end_ts = ?, status = ?, metadata = ? WHERE id = ?",
-                    (now, status.value, json.dumps(metadata), run_id)
-                )
-            else:
-                conn.execute(
-                    "UPDATE runs SET end_ts = ?, status = ? WHERE id = ?",
-                    (now, status.value, run_id)
-                )
-            
-            # Log run end event
-            self.log_event(run_id, None, EventLevel.INFO, f"Run ended with status: {status.value}")
+        # Refresh query planner statistics while the run's data is fresh
+        self._thread_connection().execute("PRAGMA optimize")
+    
+    def _end_run(self, conn: sqlite3.Connection, run_id: int, status: RunStatus,
+                 metadata: Optional[Dict[str, Any]], now: str):
+        # Update run
+        if metadata:
+            conn.execute(
+                SQL_END_RUN_WITH_METADATA,
+                (now, status.value, _dump_metadata(metadata), run_id)
+            )
+        else:
+            conn.execute(
+                SQL_END_RUN,
+                (now, status.value, run_id)
+            )
+        
+        # Log run end event
+        self.log_event(run_id, None, EventLevel.INFO, f"Run ended with status: {status.value}",
+                       conn=conn)
     
     def start_task(self, run_id: int, name: str, description: str = None, 
                    cmd: str = None, timeout: int = None, metadata: Dict[str, Any] = None) -> int:
         """Start a new task and return the task ID."""
-        now = datetime.now(timezone.utc).isoformat()
-        metadata = metadata or {}
+        now = _now_iso()
+        return self._submit_write(
+            self._start_task, run_id, name, description, cmd, timeout, metadata, now
+        ).result()
+    
+    def _start_task(self, conn: sqlite3.Connection, run_id: int, name: str,
+                    description: Optional[str], cmd: Optional[str], timeout: Optional[int],
+                    metadata: Optional[Dict[str, Any]], now: str) -> int:
+        task_id = self._insert(
+            conn, SQL_INSERT_TASK,
+            (run_id, name, description, now, TaskStatus.RUNNING.value, 
+             cmd, timeout, _dump_metadata(metadata))
+        )
         
-        with self.get_connection() as conn:
-            cursor = conn.execute(
-                """INSERT INTO tasks 
-                   (run_id, name, description, start_ts, status, cmd, timeout, metadata) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (run_id, name, description, now, TaskStatus.RUNNING.value, 
-                 cmd, timeout, json.dumps(metadata))
-            )
-            task_id = cursor.lastrowid
-            
-            # Log task start event
-            self.log_event(run_id, name, EventLevel.INFO, f"Task started: {name}")
-            
-            return task_id
+        # Log task start event
+        self.log_event(run_id, name, EventLevel.INFO, f"Task started: {name}", conn=conn)
+        
+        return task_id
     
     def end_task(self, task_id: int, status: TaskStatus, return_code: int = None,
                  stdout_path: str = None, stderr_path: str = None, 
-                 metadata: Dict[str, Any] = None):
-        """End a task with the given status and results."""
-        now = datetime.now(timezone.utc).isoformat()
+                 metadata: Dict[str, Any] = None) -> Future:
+        """
+        End a task with the given status and results.
         
-        with self.get_connection() as conn:
-            # Get task info for logging
-            task_row = conn.execute("SELECT run_id, name FROM tasks WHERE id = ?", (task_id,)).fetchone()
-            if not task_row:
-                raise ValueError(f"Task {task_id} not found")
-            
-            run_id, task_name = task_row["run_id"], task_row["name"]
-            
-            # Update task
-            update_fields = ["end_ts = ?", "status = ?"]
-            values = [now, status.value]
-            
-            if return_code is not None:
-                update_fields.append("return_code = ?")
-                values.append(return_code)
-            
-            if stdout_path:
-                update_fields.append("stdout_path = ?")
-                values.append(stdout_path)
-            
-            if stderr_path:
-                update_fields.append("stderr_path = ?")
-                values.append(stderr_path)
-            
-            if metadata:
-                update_fields.append("metadata = ?")
-                values.append(json.dumps(metadata))
-            
-            values.append(task_id)
-            
-            conn.execute(
-                f"UPDATE tasks SET {', '.join(update_fields)} WHERE id = ?",
-                values
-            )
-            
-            # Update run progress
-            if status == TaskStatus.DONE:
-                conn.execute(
-                    "UPDATE runs SET completed_tasks = completed_tasks + 1 WHERE id = ?",
-                    (run_id,)
-                )
-            
-            # Log task end event
-            level = EventLevel.INFO if status == TaskStatus.DONE else EventLevel.ERROR
-            self.log_event(run_id, task_name, level, 
-                          f"Task ended: {task_name} with status {status.value}")
+        The update is queued for the writer thread and this returns right
+        away; wait on the returned future to know it was committed.
+        
+        Returns:
+            Future that resolves once committed, or fails with ValueError if
+            the task doesn't exist
+        """
+        now = _now_iso()
+        
+        params = (now, status.value, return_code, stdout_path or None, stderr_path or None,
+                  _dump_metadata(metadata) if metadata else None, task_id)
+        
+        return self._submit_write(self._end_task, task_id, status, params)
+    
+    def _end_task(self, conn: sqlite3.Connection, task_id: int, status: TaskStatus,
+                  params: Tuple):
+        # Update task; NULL leaves the stored value untouched. The owning
+        # run and task name come back from RETURNING where available.
+        if HAS_RETURNING:
+            task_row = conn.execute(SQL_END_TASK_RETURNING_OWNER, params).fetchone()
+        else:
+            task_row = conn.execute(SQL_SELECT_TASK_OWNER, (task_id,)).fetchone()
+            if task_row:
+                conn.execute(SQL_END_TASK, params)
+        
+        if not task_row:
+            raise ValueError(f"Task {task_id} not found")
+        
+        run_id, task_name = task_row
+        
+        # Update run progress
+        if status == TaskStatus.DONE:
+            conn.execute(SQL_INCREMENT_COMPLETED, (run_id,))
+        
+        # Log task end event
+        level = EventLevel.INFO if status == TaskStatus.DONE else EventLevel.ERROR
+        self.log_event(run_id, task_name, level, 
+                      f"Task ended: {task_name} with status {status.value}", conn=conn)
     
     def log_event(self, run_id: int, task_name: str = None, level: EventLevel = EventLevel.INFO,
-                  message: str = "", metadata: Dict[str, Any] = None):
-        """Log an event for the run."""
-        now = datetime.now(timezone.utc).isoformat()
-        metadata = metadata or {}
+                  message: str = "", metadata: Dict[str, Any] = None,
+                  conn: Optional[sqlite3.Connection] = None):
+        """
+        Log an event for the run.
         
-        with self.get_connection() as conn:
-            conn.execute(
-                "INSERT INTO events (run_id, task_name, ts, level, message, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-                (run_id, task_name, now, level.value, message, json.dumps(metadata))
-            )
+        Events are buffered and written in batches: with the next write
+        transaction, or by the writer thread once EVENT_BUFFER_SIZE are
+        pending. Call flush_events() to force them out.
+        
+        Args:
+            conn: Connection with an open write transaction; when given, the
+                event and any buffered ones are inserted in that transaction
+        """
+        now = _now_iso()
+        row = (run_id, task_name, now, level.value, message, _dump_metadata(metadata))
+        
+        with self._event_lock:
+            self._event_buf.append(row)
+            pending = len(self._event_buf)
+        
+        if conn is not None:
+            self._write_events(conn)
+        elif pending >= EVENT_BUFFER_SIZE:
+            self._submit_write(self._write_events)
     
     def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
         """Get run information by ID."""
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
-            return dict(row) if row else None
+        with self.get_connection(write=False) as conn:
+            return _fetch_dict(conn.execute(SQL_SELECT_RUN, (run_id,)))
     
     def get_latest_run(self, target: str) -> Optional[Dict[str, Any]]:
         """Get the latest run for a target."""
-        with self.get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM runs WHERE target = ? ORDER BY start_ts DESC LIMIT 1",
-                (target,)
-            ).fetchone()
-            return dict(row) if row else None
+        with self.get_connection(write=False) as conn:
+            return _fetch_dict(conn.execute(SQL_SELECT_LATEST_RUN, (target,)))
     
     def get_run_tasks(self, run_id: int) -> List[Dict[str, Any]]:
         """Get all tasks for a run."""
-        with self.get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM tasks WHERE run_id = ? ORDER BY id",
-                (run_id,)
-            ).fetchall()
-            return [dict(row) for row in rows]
+        with self.get_connection(write=False) as conn:
+            return _fetch_dicts(conn.execute(SQL_SELECT_RUN_TASKS, (run_id,)))
     
-    def get_run_events(self, run_id: int, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent events for a run."""
-        with self.get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM events WHERE run_id = ? ORDER BY ts DESC LIMIT ?",
-                (run_id, limit)
-            ).fetchall()
-            return [dict(row) for row in rows]
+    def get_run_events(self, run_id: int, limit: int = 100,
+                       before: Optional[Tuple[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Get recent events for a run, newest first.
+        
+        Args:
+            run_id: Run ID
+            limit: Maximum number of events to return
+            before: Only return events older than this (ts, id) pair; pass the
+                `ts` and `id` of the last event of the previous page to page
+                backwards without skipping or repeating events
+        """
+        self.flush_events()
+        with self.get_connection(write=False) as conn:
+            # Separate statements so both are plain range scans on idx_events_run_ts
+            # (its entries end with the rowid, so id breaks ties in index order)
+            if before is None:
+                cursor = conn.execute(SQL_SELECT_RUN_EVENTS, (run_id, limit))
+            else:
+                before_ts, before_id = before
+                cursor = conn.execute(SQL_SELECT_RUN_EVENTS_BEFORE,
+                                      (run_id, before_ts, before_ts, before_id, limit))
+            return _fetch_dicts(cursor)
     
     def get_task_by_name(self, run_id: int, task_name: str) -> Optional[Dict[str, Any]]:
         """Get task by name for a specific run."""
-        with self.get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM tasks WHERE run_id = ? AND name = ?",
-                (run_id, task_name)
-            ).fetchone()
-            return dict(row) if row else None
+        with self.get_connection(write=False) as conn:
+            return _fetch_dict(conn.execute(SQL_SELECT_TASK_BY_NAME, (run_id, task_name)))
 
 
 # Helper functions for common operations
@@ -4,15 +4,33 @@ Handles sending messages, files, and status updates to Telegram.
 """
 
 import asyncio
+import hashlib
 import logging
+import threading
+import time
 from pathlib import Path
 from typing import Optional, List, Union
 from telegram import Bot, InputFile
-from telegram.error import TelegramError
-import io
+from telegram.error import BadRequest, TelegramError
 
 from .config import config
 
+# How long a successful connection test is trusted
+PROBE_CACHE_TTL = 300  # seconds
+
+# Minimum spacing between progress updates; faster updates are dropped
+PROGRESS_MIN_INTERVAL = 2.0  # seconds
+
+# BadRequest texts (lowercased) for a progress message that can't be edited
+# any more and has to be replaced by a new one
+PROGRESS_EDIT_GONE = ("message to edit not found", "message can't be edited")
+
+# Prebuilt bars for the default length, indexed by filled cell count
+PROGRESS_BAR_LENGTH = 10
+_PROGRESS_BARS = [
+    f"[{'█' * i}{'░' * (PROGRESS_BAR_LENGTH - i)}]" for i in range(PROGRESS_BAR_LENGTH + 1)
+]
+
 
 class TelegramNotifier:
     """Telegram notification sender."""
@@ -23,6 +41,17 @@ class TelegramNotifier:
         self.bot = None
         self.logger = logging.getLogger(__name__)
         
+        # Background event loop shared by all calls, see _run()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        
+        # Last progress message, edited in place by send_progress()
+        self._last_progress_msg_id: Optional[int] = None
+        self._last_progress_target: Optional[str] = None
+        self._last_progress_ts = 0.0
+        self._progress_lock = threading.Lock()
+        
         if self.bot_token and self.chat_id:
             self.bot = Bot(token=self.bot_token)
         else:
@@ -32,6 +61,54 @@ class TelegramNotifier:
         """Check if Telegram is properly configured."""
         return bool(self.bot_token and self.chat_id and self.bot)
     
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the background event loop, starting it on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="telegram-notifier", daemon=True
+                )
+                thread.start()
+                if self.bot is not None:
+                    # Reopens the HTTP client if close() shut it down
+                    asyncio.run_coroutine_threadsafe(self.bot.request.initialize(), loop).result()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+    
+    def _run(self, coro):
+        """
+        Run a coroutine on the background event loop and wait for its result.
+        
+        Keeping a single loop alive lets the bot's HTTP client reuse its
+        connection to the Telegram API across calls.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
+    
+    def close(self):
+        """
+        Shut down the bot's HTTP client and stop the background event loop.
+        
+        The notifier stays usable; the next call starts a new loop and client.
+        """
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        
+        try:
+            # Bot.shutdown() is a no-op for a bot that was never initialize()d,
+            # which this one isn't (that would cost a getMe call), so close
+            # the request object directly
+            if self.bot is not None:
+                asyncio.run_coroutine_threadsafe(self.bot.request.shutdown(), loop).result()
+        except Exception as e:
+            self.logger.debug(f"Error shutting down Telegram bot: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    
     def send_text(self, message: str, parse_mode: str = 'Markdown') -> bool:
         """
         Send a text message to Telegram.
@@ -48,20 +125,14 @@ class TelegramNotifier:
             return False
         
         try:
-            # Run async function in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(
-                    self.bot.send_message(
-                        chat_id=self.chat_id,
-                        text=message,
-                        parse_mode=parse_mode
-                    )
+            self._run(
+                self.bot.send_message(
+                    chat_id=self.chat_id,
+                    text=message,
+                    parse_mode=parse_mode
                 )
-                return True
-            finally:
-                loop.close()
+            )
+            return True
         
         except TelegramError as e:
             self.logger.error(f"Failed to send Telegram message: {e}")
@@ -90,21 +161,18 @@ class TelegramNotifier:
             return False
         
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                with open(file_path, 'rb') as f:
-                    result = loop.run_until_complete(
-                        self.bot.send_document(
-                            chat_id=self.chat_id,
-                            document=f,
-                            filename=file_path.name,
-                            caption=caption
-                        )
+            with open(file_path, 'rb') as f:
+                # Hand the open handle to the HTTP backend so the upload
+                # streams from disk instead of loading the whole file
+                document = InputFile(f, filename=file_path.name, read_file_handle=False)
+                self._run(
+                    self.bot.send_document(
+                        chat_id=self.chat_id,
+                        document=document,
+                        caption=caption
                     )
-                return True
-            finally:
-                loop.close()
+                )
+            return True
         
         except TelegramError as e:
             self.logger.error(f"Failed to send Telegram file: {e}")
@@ -143,24 +211,18 @@ class TelegramNotifier:
             return False
         
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                # Create file-like object from text
-                text_file = io.BytesIO(text.encode('utf-8'))
-                text_file.name = filename
-                
-                result = loop.run_until_complete(
-                    self.bot.send_document(
-                        chat_id=self.chat_id,
-                        document=text_file,
-                        filename=filename,
-                        caption=caption
-                    )
+            # Upload the encoded bytes directly; a BytesIO wrapper would
+            # just be read back into another full copy by InputFile
+            document = InputFile(text.encode('utf-8'), filename=filename)
+            
+            self._run(
+                self.bot.send_document(
+                    chat_id=self.chat_id,
+                    document=document,
+                    caption=caption
                 )
-                return True
-            finally:
-                loop.close()
+            )
+            return True
         
         except TelegramError as e:
             self.logger.error(f"Failed to send text as Telegram file: {e}")
@@ -174,6 +236,11 @@ class TelegramNotifier:
         """
         Send progress update to Telegram.
         
+        Updates for the same target edit the previous progress message
+        instead of posting a new one, and updates arriving within
+        PROGRESS_MIN_INTERVAL of the last one are dropped. The final
+        update (completed == total) is always delivered.
+        
         Args:
             target: Target name
             completed: Number of completed tasks
@@ -182,8 +249,20 @@ class TelegramNotifier:
             eta_seconds: Estimated time to completion
         
         Returns:
-            True if message sent successfully
+            True if the update was sent or intentionally dropped
         """
+        if not self.is_configured():
+            return False
+        
+        finished = completed >= total
+        now = time.monotonic()
+        with self._progress_lock:
+            same_target = self._last_progress_target == target
+            if same_target and not finished and now - self._last_progress_ts < PROGRESS_MIN_INTERVAL:
+                return True
+            self._last_progress_ts = now
+            message_id = self._last_progress_msg_id if same_target else None
+        
         percentage = (completed / total * 100) if total > 0 else 0
         progress_bar = self._create_progress_bar(percentage)
         
@@ -198,7 +277,51 @@ class TelegramNotifier:
             eta_str = self._format_duration(eta_seconds)
             message += f"ETA: {eta_str}\n"
         
-        return self.send_text(message)
+        try:
+            if message_id is not None:
+                try:
+                    self._run(
+                        self.bot.edit_message_text(
+                            text=message,
+                            chat_id=self.chat_id,
+                            message_id=message_id,
+                            parse_mode='Markdown'
+                        )
+                    )
+                except BadRequest as e:
+                    reason = e.message.lower()
+                    if "message is not modified" in reason:
+                        # Same text as the message already shows
+                        pass
+                    elif any(gone in reason for gone in PROGRESS_EDIT_GONE):
+                        # Deleted or too old to edit: post a new one
+                        self.logger.debug(f"Could not edit progress message: {e}")
+                        message_id = None
+                    else:
+                        raise
+            
+            if message_id is None:
+                sent = self._run(
+                    self.bot.send_message(
+                        chat_id=self.chat_id,
+                        text=message,
+                        parse_mode='Markdown'
+                    )
+                )
+                message_id = sent.message_id
+        
+        except TelegramError as e:
+            self.logger.error(f"Failed to send Telegram progress update: {e}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Unexpected error sending Telegram progress update: {e}")
+            return False
+        
+        with self._progress_lock:
+            # A finished run starts a fresh message next time
+            self._last_progress_target = None if finished else target
+            self._last_progress_msg_id = None if finished else message_id
+        return True
     
     def send_completion_summary(self, target: str, success: bool, 
                               completed: int, total: int, duration_seconds: int) -> bool:
@@ -244,9 +367,11 @@ class TelegramNotifier:
         
         return self.send_text(message)
     
-    def _create_progress_bar(self, percentage: float, length: int = 10) -> str:
+    def _create_progress_bar(self, percentage: float, length: int = PROGRESS_BAR_LENGTH) -> str:
         """Create a text progress bar."""
         filled = int(length * percentage / 100)
+        if length == PROGRESS_BAR_LENGTH and 0 <= filled <= length:
+            return _PROGRESS_BARS[filled]
         bar = "█" * filled + "░" * (length - filled)
         return f"[{bar}]"
     
@@ -274,32 +399,74 @@ class TelegramNotifier:
             return False
         
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(self.bot.get_me())
-                self.logger.info(f"Telegram bot connected: @{result.username}")
-                return True
-            finally:
-                loop.close()
+            result = self._run(self.bot.get_me())
+            self.logger.info(f"Telegram bot connected: @{result.username}")
+            return True
         
         except Exception as e:
             self.logger.error(f"Telegram connection test failed: {e}")
             return False
+    
+    
+    def test_connection_cached(self, ttl: int = PROBE_CACHE_TTL) -> bool:
+        """
+        Test Telegram connection, reusing a recent successful result.
+        
+        Successful probes are recorded in the user cache directory for
+        the current bot token and trusted for `ttl` seconds.
+        
+        Args:
+            ttl: Seconds a successful probe stays valid
+        
+        Returns:
+            True if connection successful
+        """
+        if not self.is_configured():
+            return False
+        
+        marker = config.cache_dir / "telegram_ok"
+        token_hash = hashlib.sha256(self.bot_token.encode('utf-8')).hexdigest()
+        
+        try:
+            if (time.time() - marker.stat().st_mtime < ttl and
+                    marker.read_text(encoding='utf-8') == token_hash):
+                return True
+        except OSError:
+            pass
+        
+        if not self.test_connection():
+            return False
+        
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(token_hash, encoding='utf-8')
+        except OSError as e:
+            self.logger.debug(f"Could not cache Telegram probe result: {e}")
+        
+        return True
 
 
-# Global notifier instance
+# Global notifier instance, shared so there is one Bot and HTTP client per process
 _notifier_instance = None
+_notifier_lock = threading.Lock()
 
 
 def get_notifier() -> Optional[TelegramNotifier]:
     """Get global notifier instance."""
     global _notifier_instance
     if _notifier_instance is None and config.is_telegram_configured():
-        _notifier_instance = TelegramNotifier()
+        with _notifier_lock:
+            if _notifier_instance is None:
+                _notifier_instance = TelegramNotifier()
     return _notifier_instance
 
 
+def close_notifier():
+    """Shut down the global notifier's connection, if one was created."""
+    if _notifier_instance is not None:
+        _notifier_instance.close()
+
+
 def create_notifier(bot_token: str = None, chat_id: str = None) -> TelegramNotifier:
     """Create a new notifier instance."""
     return TelegramNotifier(bot_token, chat_id)
\ No newline at end of file
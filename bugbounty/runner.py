@@ -4,24 +4,416 @@ Handles YAML pipeline execution, dependency resolution, and concurrent task mana
 """
 
 import asyncio
+import ctypes
+import logging
 import subprocess
 import signal
-import psutil
-import yaml
+import struct
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Set
+import heapq
+from concurrent import futures
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import threading
 import time
 import os
 
+from .builtin_ops import BUILTIN_OPS, BUILTIN_PREFIX
 from .config import config
 from .db import Database, init_db
-from .templating import materialize_env, render_task_command, validate_template_vars
-from .utils import read_json, write_json, check_stop_flag, format_duration, console
-from .constants import TaskStatus, RunStatus, EventLevel, TaskKind
-from .notifier import TelegramNotifier
+from .templating import materialize_env, compile_template, render_compiled, missing_template_vars
+from .utils import read_json, write_json, load_yaml, format_duration, console
+from .constants import (
+    TaskStatus, RunStatus, EventLevel, TaskKind, STOP_FLAG_POLL_INTERVAL
+)
+
+if TYPE_CHECKING:
+    # Annotation only; importing python-telegram-bot is slow and runs
+    # without notifications (--no-telegram) never need it
+    from .notifier import TelegramNotifier
+
+# Minimum spacing between progress.json writes while the pipeline runs
+PROGRESS_WRITE_INTERVAL = 0.25  # seconds
+
+# Threads for blocking work (database calls, internal tasks) during a run
+BLOCKING_WORKERS = 4
+
+# Blocking-work pools shared by every run in the process, see _get_pool()
+_POOL_CACHE: Dict[int, ThreadPoolExecutor] = {}
+_POOL_LOCK = threading.Lock()
+
+# inotify(7) flags and event header (wd, mask, cookie, len)
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# runner.log line layout
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@contextmanager
+def _pidfd_child_watcher():
+    """
+    Reap the running loop's subprocesses through pidfds where available.
+    
+    Before Python 3.12 the default watcher starts a thread per child, which
+    is what the event-loop runner is meant to avoid. 3.12+ already picks the
+    pidfd watcher on its own. The watcher is process-global and bound to the
+    running loop, so the previous one is put back on exit.
+    """
+    if os.name == 'nt' or sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        yield
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except (AttributeError, OSError):
+        yield
+        return
+    previous = asyncio.get_child_watcher()
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_running_loop())
+    asyncio.set_child_watcher(watcher)
+    try:
+        yield
+    finally:
+        # Closes the pidfd watcher too
+        asyncio.set_child_watcher(previous)
+
+
+def _get_pool(workers: int) -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool with the given number of workers.
+    
+    Pools live until interpreter exit, where concurrent.futures joins their
+    threads, so repeated runs don't pay for thread startup again.
+    """
+    with _POOL_LOCK:
+        pool = _POOL_CACHE.get(workers)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="runner")
+            _POOL_CACHE[workers] = pool
+        return pool
+
+
+def _encode_env(variables: Dict[str, Any]) -> Dict[Any, Any]:
+    """
+    Build the child process environment once per run.
+    
+    Values from tasks.yaml may be numbers, so everything is stringified. On
+    POSIX the result is pre-encoded to bytes, which subprocess passes through
+    as-is instead of encoding every entry again on each spawn.
+    """
+    if os.name == 'nt':
+        return {str(key): str(value) for key, value in variables.items()}
+    return {os.fsencode(str(key)): os.fsencode(str(value)) for key, value in variables.items()}
+
+
+async def _spawn_posix(cmd: str, stdout, stderr, env):
+    """Start a shell command in its own session (process group)."""
+    return await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=stdout,
+        stderr=stderr,
+        env=env,
+        # Same as preexec_fn=os.setsid, but keeps CPython on its vfork()
+        # fast path
+        start_new_session=True
+    )
+
+
+async def _spawn_windows(cmd: str, stdout, stderr, env):
+    """Start a shell command in a new process group."""
+    return await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=stdout,
+        stderr=stderr,
+        env=env,
+        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
+    )
+
+
+# Return code of a stage killed for writing to a closed pipe (POSIX only)
+_SIGPIPE_RETURNCODE = -signal.SIGPIPE if hasattr(signal, 'SIGPIPE') else None
+
+
+class _ProcessChain:
+    """
+    The processes of a pipe task, handled like a single process.
+    
+    Provides the parts of asyncio.subprocess.Process the runner uses. The
+    chain is only done once every stage has exited. Like a shell pipeline
+    with pipefail, its return code is the last non-zero one of any stage,
+    so a failing middle stage fails the task. An earlier stage killed by
+    SIGPIPE only means a later one stopped reading early, and is ignored.
+    """
+    
+    def __init__(self, processes: List[Any]):
+        self.processes = processes
+        self.pid = processes[-1].pid
+    
+    @property
+    def group_ids(self) -> List[int]:
+        """Process groups of the stages (POSIX: each stage leads its own)."""
+        return [process.pid for process in self.processes]
+    
+    def _chain_returncode(self) -> int:
+        returncodes = [process.returncode for process in self.processes]
+        if returncodes[-1] != 0:
+            return returncodes[-1]
+        for returncode in reversed(returncodes[:-1]):
+            if returncode not in (0, _SIGPIPE_RETURNCODE):
+                return returncode
+        return 0
+    
+    @property
+    def returncode(self) -> Optional[int]:
+        if any(process.returncode is None for process in self.processes):
+            return None
+        return self._chain_returncode()
+    
+    async def wait(self) -> int:
+        await asyncio.gather(*(process.wait() for process in self.processes))
+        return self._chain_returncode()
+    
+    def send_signal(self, sig):
+        for process in self.processes:
+            if process.returncode is None:
+                process.send_signal(sig)
+    
+    def terminate(self):
+        for process in self.processes:
+            if process.returncode is None:
+                process.terminate()
+    
+    def kill(self):
+        for process in self.processes:
+            if process.returncode is None:
+                process.kill()
+
+
+async def _spawn_chain(argvs: List[List[str]], stdout, stderr, env,
+                       group_kwargs: Dict[str, Any]) -> _ProcessChain:
+    """
+    Start the stages of a pipe task connected stdout to stdin, without a shell.
+    
+    Stages are started last to first, so each reader is running before its
+    writer starts.
+    
+    Args:
+        argvs: Argument lists, in pipeline order
+        stdout: Destination of the last stage's output
+        stderr: Destination of every stage's errors
+        env: Environment for every stage
+        group_kwargs: Process group arguments for every stage
+    
+    Returns:
+        The started chain
+    """
+    # pipes[i] carries stage i's output to stage i + 1
+    pipes = [os.pipe() for _ in argvs[:-1]]
+    open_fds = {fd for pipe in pipes for fd in pipe}
+    processes: List[Any] = [None] * len(argvs)
+    
+    try:
+        for index in range(len(argvs) - 1, -1, -1):
+            stage_stdin = pipes[index - 1][0] if index > 0 else None
+            stage_stdout = pipes[index][1] if index < len(pipes) else stdout
+            processes[index] = await asyncio.create_subprocess_exec(
+                *argvs[index],
+                stdin=stage_stdin,
+                stdout=stage_stdout,
+                stderr=stderr,
+                env=env,
+                **group_kwargs
+            )
+            
+            # The child holds its own copies now
+            if stage_stdin is not None:
+                os.close(stage_stdin)
+                open_fds.discard(stage_stdin)
+            if index < len(pipes):
+                os.close(stage_stdout)
+                open_fds.discard(stage_stdout)
+    except BaseException:
+        for fd in open_fds:
+            os.close(fd)
+        for process in processes:
+            if process is not None and process.returncode is None:
+                process.kill()
+        raise
+    
+    return _ProcessChain(processes)
+
+
+async def _spawn_chain_posix(argvs: List[List[str]], stdout, stderr, env) -> _ProcessChain:
+    """Start a pipe task with each stage in its own process group."""
+    # Every stage leads its own session, like a shell task. Joining one
+    # shared group would need setpgid() in the child, which before Python
+    # 3.11 means a preexec_fn: unsafe with the runner's threads, and racy
+    # once the group leader has exited.
+    return await _spawn_chain(argvs, stdout, stderr, env, {"start_new_session": True})
+
+
+async def _spawn_chain_windows(argvs: List[List[str]], stdout, stderr, env) -> _ProcessChain:
+    """Start a pipe task; signals are sent to every stage."""
+    # Every stage gets its own group for CTRL_BREAK
+    return await _spawn_chain(argvs, stdout, stderr, env,
+                              {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP})
+
+
+if os.name != 'nt':
+    # Bound once for the POSIX helpers below, which run for every task in
+    # a cancellation broadcast
+    _killpg = os.killpg
+    _SIGTERM = signal.SIGTERM
+    _SIGKILL = signal.SIGKILL
+
+
+def _signal_groups_posix(process, sig):
+    """
+    Signal a task's process group, or every stage's group for a pipe task.
+    
+    The shell (or stage) leads its own session, so its pid is the group id;
+    no getpgid() round trip needed, and this still reaches leftover children
+    after the leader itself was reaped.
+    
+    Raises:
+        ProcessLookupError: If none of the groups exists any more
+    """
+    if not isinstance(process, _ProcessChain):
+        _killpg(process.pid, sig)
+        return
+    
+    reached = False
+    for pgid in process.group_ids:
+        try:
+            _killpg(pgid, sig)
+            reached = True
+        except ProcessLookupError:
+            pass
+    if not reached:
+        raise ProcessLookupError(f"No process group left for pipe task {process.pid}")
+
+
+def _terminate_posix(process):
+    """Ask a task's whole process group to exit."""
+    _signal_groups_posix(process, _SIGTERM)
+
+
+def _kill_posix(process):
+    """Force-kill a task's whole process group."""
+    _signal_groups_posix(process, _SIGKILL)
+
+
+def _terminate_windows(process):
+    """Ask a task's process group to exit."""
+    # Tasks start with CREATE_NEW_PROCESS_GROUP, so CTRL_BREAK reaches the
+    # shell's children too, unlike TerminateProcess on the shell alone
+    process.send_signal(signal.CTRL_BREAK_EVENT)
+
+
+def _kill_windows(process):
+    """Force-kill a task's process if it is still running."""
+    if process.returncode is None:
+        process.kill()
+
+
+# Platform-specific process handling, resolved once at import
+if os.name == 'nt':
+    _spawn_impl, _terminate_impl, _kill_impl = _spawn_windows, _terminate_windows, _kill_windows
+    _spawn_chain_impl = _spawn_chain_windows
+else:
+    _spawn_impl, _terminate_impl, _kill_impl = _spawn_posix, _terminate_posix, _kill_posix
+    _spawn_chain_impl = _spawn_chain_posix
+
+
+class _RunnerLogFormatter(logging.Formatter):
+    """Formatter that renders the timestamp at most once per second."""
+    
+    def __init__(self):
+        super().__init__(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        self._cached_second = None
+        self._cached_time = ""
+    
+    def formatTime(self, record, datefmt=None):
+        # Handlers format under their lock, so the cache needs no lock of its own
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = time.strftime(self.datefmt, time.localtime(second))
+            self._cached_second = second
+        return self._cached_time
+
+
+class _StopWatcher:
+    """
+    Notice the stop flag file without stat()ing it on every scheduler tick.
+    
+    On Linux an inotify watch on the target directory reports the flag being
+    created; hand fd to the event loop and call read_events() when it is
+    readable. Elsewhere, or if inotify is unavailable, stop_requested()
+    falls back to stat() at most every STOP_FLAG_POLL_INTERVAL seconds.
+    """
+    
+    def __init__(self, flag_path: Path):
+        self.flag_path = flag_path
+        self.fd: Optional[int] = None
+        self._flag_name = os.fsencode(flag_path.name)
+        self._next_poll = 0.0
+        
+        if sys.platform.startswith('linux'):
+            try:
+                libc = ctypes.CDLL(None, use_errno=True)
+                fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+                if fd >= 0:
+                    if libc.inotify_add_watch(fd, os.fsencode(flag_path.parent),
+                                              IN_CREATE | IN_MOVED_TO) >= 0:
+                        self.fd = fd
+                    else:
+                        os.close(fd)
+            except (OSError, AttributeError):
+                pass
+        
+        # The watch only reports new files, so look once for one created earlier
+        self.triggered = flag_path.exists()
+    
+    def read_events(self):
+        """Consume pending inotify events and note whether the flag appeared."""
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            if not data:
+                return
+            
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                if data[offset:offset + name_len].rstrip(b"\0") == self._flag_name:
+                    self.triggered = True
+                offset += name_len
+    
+    def stop_requested(self) -> bool:
+        """Check whether the stop flag has been created."""
+        if self.triggered or self.fd is not None:
+            return self.triggered
+        
+        now = time.monotonic()
+        if now >= self._next_poll:
+            self._next_poll = now + STOP_FLAG_POLL_INTERVAL
+            self.triggered = self.flag_path.exists()
+        return self.triggered
+    
+    def close(self):
+        """Release the inotify descriptor."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
 
 
 class Task:
@@ -31,8 +423,28 @@ class Task:
         self.name = name
         self.task_number = task_number
         self.description = config_data.get('desc', config_data.get('description', ''))
-        self.cmd = config_data.get('cmd', '')
         self.kind = config_data.get('kind', TaskKind.SHELL.value)
+        # Argument lists of a pipe task, run without a shell
+        self.cmds = config_data.get('cmds') or []
+        # Arguments of a builtin:<op> task
+        self.args = config_data.get('args') or {}
+        self.cmd = config_data.get('cmd', '')
+        if not self.cmd and self.cmds:
+            # Readable form for logs and the database
+            self.cmd = " | ".join(" ".join(str(arg) for arg in argv) for argv in self.cmds)
+        elif not self.cmd and self.is_builtin() and isinstance(self.args, dict):
+            self.cmd = " ".join([self.kind] + [f"{key}={value}" for key, value in self.args.items()])
+        # Parsed once here, rendered with the run's variables at execution
+        self.cmd_plan = compile_template(self.cmd)
+        self.cmds_plan = tuple(
+            tuple(compile_template(str(arg)) for arg in argv) for argv in self.cmds
+        )
+        self.args_plan = {
+            key: compile_template(value) if isinstance(value, str)
+            else [compile_template(str(item)) for item in value] if isinstance(value, list)
+            else value
+            for key, value in (self.args.items() if isinstance(self.args, dict) else ())
+        }
         self.needs = config_data.get('needs', [])
         self.timeout = config_data.get('timeout')
         self.metadata = config_data.get('metadata', {})
@@ -43,21 +455,47 @@ class Task:
         self.process = None
         self.task_id = None
     
-    def is_ready(self, completed_tasks: Set[str]) -> bool:
-        """Check if task dependencies are satisfied."""
-        return all(dep in completed_tasks for dep in self.needs)
-    
     def is_internal(self) -> bool:
         """Check if this is an internal task."""
         return self.kind.startswith('internal:')
+    
+    def is_pipe(self) -> bool:
+        """Check if this is a shell-less pipe task."""
+        return self.kind == TaskKind.PIPE.value
+    
+    def is_builtin(self) -> bool:
+        """Check if this task runs a builtin op in-process."""
+        return self.kind.startswith(BUILTIN_PREFIX)
+    
+    def render_args(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Render the template strings among the builtin op arguments."""
+        rendered = {}
+        for key, value in self.args.items():
+            plan = self.args_plan[key]
+            if isinstance(value, str):
+                rendered[key] = render_compiled(plan, variables)
+            elif isinstance(value, list):
+                rendered[key] = [render_compiled(item, variables) for item in plan]
+            else:
+                rendered[key] = value
+        return rendered
 
 
 class TaskRunner:
     """Main task runner class."""
     
-    def __init__(self, target: str, notifier: Optional[TelegramNotifier] = None, use_database: bool = True):
+    def __init__(self, target: str, notifier: Optional["TelegramNotifier"] = None, use_database: bool = True):
         self.target = target
         self.target_dir = config.target_dir(target)
+        
+        # Per-target paths used on every task start and progress tick
+        paths = config.for_target(target)
+        self._logs_task_dir = paths.task_logs_dir
+        # Every directory the run writes to (task logs included), created
+        # once here rather than again at the start of run()
+        config.ensure_target_structure(target)
+        self._progress_path = paths.progress_json
+        self._stop_flag_path = paths.stop_flag
         self.use_database = use_database
         
         # Database (optional)
@@ -71,13 +509,22 @@ class TaskRunner:
                 self.use_database = False
         
         self.notifier = notifier
+        # Notifications still being sent in the background, see _notify()
+        self._notifications: List[futures.Future] = []
         self.run_id = None
         self.tasks = {}
+        self.dependents: Dict[str, List[str]] = {}
+        # Longest chain of dependents below each task, see _critical_path_priorities()
+        self._priority: Dict[str, int] = {}
         self.variables = {}
+        # Child environment derived from self.variables, see _encode_env()
+        self._env: Dict[Any, Any] = {}
         self.concurrency = config.CONCURRENCY
         self.executor = None
+        self._blocking_futures: Set[futures.Future] = set()
         self.stop_event = threading.Event()
-        self.db_lock = threading.Lock()  # Lock for database access
+        # Set while the pipeline runs; wakes the scheduler from any thread
+        self._wake_scheduler: Optional[Callable[[], None]] = None
         self.logger = self._setup_logging()
         
         # File-based state tracking (for non-database mode)
@@ -85,19 +532,40 @@ class TaskRunner:
         self.failed_tasks: Set[str] = set()
         self.running_tasks: Set[str] = set()
         self.start_time = None
+        
+        # Progress reporting state, see _update_progress()
+        self.run_status = RunStatus.PENDING
+        self.active_tasks: Dict[str, Any] = {}
+        self._start_monotonic: Optional[float] = None
+        self._last_progress_write = 0.0
+        self._last_progress_state: Optional[tuple] = None
     
     def _safe_db_call(self, operation: str, *args, **kwargs):
         """Safely call database operations, fallback to file-based tracking."""
         if self.use_database and self.db:
+            # The database serializes writes on its own writer thread and
+            # gives each thread its own read connection, so no lock here
             try:
-                with self.db_lock:
-                    method = getattr(self.db, operation)
-                    return method(*args, **kwargs)
+                method = getattr(self.db, operation)
+                result = method(*args, **kwargs)
             except Exception as e:
-                self.logger.warning(f"Database operation '{operation}' failed: {e}")
-                self.use_database = False
+                self._db_call_failed(operation, e)
+            else:
+                if isinstance(result, futures.Future):
+                    # Queued writes (end_task) fail later, on the writer thread
+                    def on_done(future: futures.Future):
+                        if not future.cancelled() and future.exception() is not None:
+                            self._db_call_failed(operation, future.exception())
+                    
+                    result.add_done_callback(on_done)
+                return result
         return None
     
+    def _db_call_failed(self, operation: str, error: Exception):
+        """Log a failed database operation and fall back to file-based tracking."""
+        self.logger.warning(f"Database operation '{operation}' failed: {error}")
+        self.use_database = False
+    
     def _log_file_event(self, level: str, message: str, task_name: str = "", metadata: dict = None):
         """Log events to file when database is not available."""
         log_entry = {
@@ -122,25 +590,21 @@ class TaskRunner:
     
     def _setup_logging(self):
         """Setup logging for the runner."""
-        import logging
-        
         log_path = config.runner_log_path(self.target)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
         
         logger = logging.getLogger(f"runner_{self.target}")
         logger.setLevel(logging.DEBUG)
         
-        # Remove existing handlers
+        # Runners for the same target share the handler that is already open
         for handler in logger.handlers[:]:
+            if isinstance(handler, logging.FileHandler) and handler.baseFilename == os.path.abspath(log_path):
+                return logger
             logger.removeHandler(handler)
+            handler.close()
         
-        # File handler
-        handler = logging.FileHandler(log_path, encoding='utf-8')
-        formatter = logging.Formatter(
-            '%(asctime)s [%(levelname)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        handler.setFormatter(formatter)
+        # File handler; the file is only opened once something is logged
+        handler = logging.FileHandler(log_path, encoding='utf-8', delay=True)
+        handler.setFormatter(_RunnerLogFormatter())
         logger.addHandler(handler)
         
         return logger
@@ -155,16 +619,17 @@ class TaskRunner:
         Returns:
             True if tasks loaded successfully
         """
+        cache_file = None
         if tasks_file is None:
             tasks_file = config.tasks_yaml_path(self.target)
+            cache_file = config.tasks_cache_path(self.target)
         
         if not tasks_file.exists():
             self.logger.error(f"Tasks file not found: {tasks_file}")
             return False
         
         try:
-            with open(tasks_file, 'r', encoding='utf-8') as f:
-                tasks_config = yaml.safe_load(f)
+            tasks_config = load_yaml(tasks_file, cache_file)
             
             # Extract configuration
             self.concurrency = tasks_config.get('concurrency', config.CONCURRENCY)
@@ -174,6 +639,7 @@ class TaskRunner:
             # Materialize environment variables
             self.variables = materialize_env(self.target, custom_vars)
             self.variables.update(env_vars)
+            self._env = _encode_env(self.variables)
             
             # Load tasks
             pipeline = tasks_config.get('pipeline', [])
@@ -188,11 +654,21 @@ class TaskRunner:
                 task = Task(task_name, task_config, i + 1)
                 self.tasks[task_name] = task
             
+            # Reverse dependency map, so a finished task only has to look at
+            # the tasks that need it
+            self.dependents = {name: [] for name in self.tasks}
+            for task_name, task in self.tasks.items():
+                for dep in task.needs:
+                    if dep in self.dependents:
+                        self.dependents[dep].append(task_name)
+            self._priority = self._critical_path_priorities()
+            
             self.logger.info(f"Loaded {len(self.tasks)} tasks from {tasks_file}")
             
             # Debug: log all loaded tasks and their dependencies
-            for task_name, task in self.tasks.items():
-                self.logger.debug(f"Task '{task_name}': needs={task.needs}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                for task_name, task in self.tasks.items():
+                    self.logger.debug(f"Task '{task_name}': needs={task.needs}")
             
             return True
             
@@ -208,41 +684,107 @@ class TaskRunner:
             List of validation errors
         """
         errors = []
-        task_names = set(self.tasks.keys())
         
         for task_name, task in self.tasks.items():
             # Check dependencies exist
             for dep in task.needs:
-                if dep not in task_names:
+                if dep not in self.tasks:
                     errors.append(f"Task '{task_name}' depends on unknown task '{dep}'")
             
-            # Check for circular dependencies (simple check)
-            visited = set()
+            if task.is_pipe() and (
+                not task.cmds
+                or not isinstance(task.cmds, list)
+                or not all(isinstance(argv, list) and argv for argv in task.cmds)
+            ):
+                errors.append(f"Task '{task_name}' of kind pipe needs 'cmds' as a list of argument lists")
             
-            def check_circular(name, path):
-                if name in path:
-                    return f"Circular dependency detected: {' -> '.join(path + [name])}"
-                if name in visited:
-                    return None
-                
-                visited.add(name)
-                if name in self.tasks:
-                    for dep in self.tasks[name].needs:
-                        result = check_circular(dep, path + [name])
-                        if result:
-                            return result
-                return None
-            
-            circular_error = check_circular(task_name, [])
-            if circular_error:
-                errors.append(circular_error)
+            if task.is_builtin():
+                op = task.kind[len(BUILTIN_PREFIX):]
+                if op not in BUILTIN_OPS:
+                    errors.append(f"Task '{task_name}' uses unknown builtin op '{op}' "
+                                  f"(available: {', '.join(BUILTIN_OPS)})")
+                if not isinstance(task.args, dict):
+                    errors.append(f"Task '{task_name}' needs 'args' as a mapping")
             
             # Validate command templates
             if not task.is_internal():
-                missing_vars = validate_template_vars(task.cmd, self.variables)
+                missing_vars = missing_template_vars(task.cmd_plan, self.variables)
                 if missing_vars:
                     errors.append(f"Task '{task_name}' uses undefined variables: {missing_vars}")
         
+        # Check for circular dependencies with a single topological sort
+        # (Kahn's algorithm): tasks that never reach zero unmet dependencies
+        # are on a cycle or depend on one
+        ordered = self._topological_order()
+        blocked = self.tasks.keys() - set(ordered)
+        if blocked:
+            errors.extend(self._describe_cycles(blocked))
+        
+        return errors
+    
+    def _topological_order(self) -> List[str]:
+        """
+        Order tasks so that every task comes after the tasks it needs.
+        
+        Tasks on a dependency cycle, or depending on one, are left out.
+        
+        Returns:
+            List of task names in dependency order
+        """
+        indegree = {name: sum(1 for dep in task.needs if dep in self.tasks)
+                    for name, task in self.tasks.items()}
+        ordered = [name for name, count in indegree.items() if count == 0]
+        # Kahn's algorithm; the list grows while it is being walked
+        for name in ordered:
+            for dependent in self.dependents.get(name, ()):
+                if dependent in indegree:
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        ordered.append(dependent)
+        return ordered
+    
+    def _critical_path_priorities(self) -> Dict[str, int]:
+        """
+        Compute each task's scheduling priority.
+        
+        The priority is the length of the longest chain of tasks that depend
+        on it, directly or transitively. Starting those tasks first keeps
+        the critical path moving while shorter branches fill spare slots.
+        
+        Returns:
+            Dictionary mapping task name to priority (0 for leaves)
+        """
+        priority: Dict[str, int] = {}
+        for name in reversed(self._topological_order()):
+            priority[name] = max((priority[dependent] + 1
+                                  for dependent in self.dependents.get(name, ())
+                                  if dependent in priority), default=0)
+        return priority
+    
+    def _describe_cycles(self, blocked: Set[str]) -> List[str]:
+        """Describe each dependency cycle among tasks left over by the topological sort."""
+        errors = []
+        seen: Set[str] = set()
+        
+        for start in self.tasks:
+            if start not in blocked or start in seen:
+                continue
+            
+            # Every blocked task needs another blocked task, so following
+            # those edges must eventually revisit a task
+            path: List[str] = []
+            position: Dict[str, int] = {}
+            name = start
+            while name not in seen and name not in position:
+                position[name] = len(path)
+                path.append(name)
+                name = next(dep for dep in self.tasks[name].needs if dep in blocked)
+            
+            if name in position:
+                cycle = path[position[name]:] + [name]
+                errors.append(f"Circular dependency detected: {' -> '.join(cycle)}")
+            seen.update(path)
+        
         return errors
     
     def run(self, resume: bool = False, task_filter: Optional[List[str]] = None) -> bool:
@@ -257,9 +799,6 @@ class TaskRunner:
             True if run completed successfully
         """
         try:
-            # Setup
-            config.ensure_target_structure(self.target)
-            
             if not self.load_tasks():
                 return False
             
@@ -288,17 +827,19 @@ class TaskRunner:
                 )
             else:
                 self.run_id = 1  # Simple counter for non-database mode
-                self.start_time = datetime.now()
+            
+            self.start_time = datetime.now(timezone.utc)
+            self._start_monotonic = time.monotonic()
+            self.run_status = RunStatus.RUNNING
             
             self.logger.info(f"Starting run {self.run_id} for target {self.target}")
-            self._update_progress()
+            self._update_progress(force=True)
             
-            if self.notifier:
-                self.notifier.send_text(
-                    f"🚀 Started bug bounty run for {self.target}\n"
-                    f"Tasks: {len(self.tasks)}\n"
-                    f"Concurrency: {self.concurrency}"
-                )
+            self._notify(
+                f"🚀 Started bug bounty run for {self.target}\n"
+                f"Tasks: {len(self.tasks)}\n"
+                f"Concurrency: {self.concurrency}"
+            )
             
             # Execute pipeline
             success = self._execute_pipeline()
@@ -307,16 +848,20 @@ class TaskRunner:
             final_status = RunStatus.DONE if success else RunStatus.ERROR
             if self.use_database:
                 self._safe_db_call("end_run", self.run_id, final_status)
+                self._safe_db_call("close")
             
+            self.run_status = final_status
             self.logger.info(f"Run {self.run_id} completed with status: {final_status.value}")
-            self._update_progress()
+            self._update_progress(force=True)
             
             if self.notifier:
+                # Keep the messages in order behind the start notification
+                self._drain_notifications()
                 status_emoji = "✅" if success else "❌"
                 self.notifier.send_text(
                     f"{status_emoji} Bug bounty run completed for {self.target}\n"
                     f"Status: {final_status.value}\n"
-                    f"Tasks completed: {sum(1 for t in self.tasks.values() if t.status == TaskStatus.DONE)}/{len(self.tasks)}"
+                    f"Tasks completed: {len(self.completed_tasks)}/{len(self.tasks)}"
                 )
             
             return success
@@ -325,83 +870,187 @@ class TaskRunner:
             self.logger.error(f"Run failed with exception: {e}")
             if self.run_id and self.use_database:
                 self._safe_db_call("end_run", self.run_id, RunStatus.ERROR, {"error": str(e)})
+                self._safe_db_call("close")
             return False
+        
+        finally:
+            # The notifier's event loop runs on a daemon thread; don't let
+            # the process exit with a message half sent, then release its
+            # connection
+            self._drain_notifications()
+            if self.notifier:
+                self.notifier.close()
+    
+    def _notify(self, message: str):
+        """
+        Send a notification without waiting for it.
+        
+        Telegram round trips take a few hundred milliseconds, so the message
+        goes out from the blocking pool while the run carries on.
+        
+        Args:
+            message: Message text
+        """
+        if self.notifier:
+            pool = _get_pool(BLOCKING_WORKERS)
+            self._notifications.append(pool.submit(self.notifier.send_text, message))
+    
+    def _drain_notifications(self):
+        """Wait for notifications queued by _notify() to be sent."""
+        if self._notifications:
+            futures.wait(self._notifications)
+            self._notifications.clear()
     
     def _execute_pipeline(self) -> bool:
         """Execute the task pipeline with dependency resolution."""
+        return asyncio.run(self._execute_pipeline_async())
+    
+    async def _execute_pipeline_async(self) -> bool:
+        """Drive the pipeline from an event loop that waits on all children at once."""
+        with _pidfd_child_watcher():
+            return await self._schedule_tasks_async()
+    
+    async def _schedule_tasks_async(self) -> bool:
+        """Start tasks as their dependencies complete until the pipeline is done."""
         # Use instance variables for state consistency
         completed_tasks = self.completed_tasks
-        running_tasks = {}
+        running_tasks = self.active_tasks
         failed_tasks = self.failed_tasks
         
-        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        # Finished tasks report here; the loop below sleeps on it instead of
+        # polling the running tasks. None only wakes the loop up (stop).
+        done_queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        
+        # Dependencies each pending task is still waiting for
+        remaining_needs = {
+            name: sum(1 for dep in task.needs if dep not in completed_tasks)
+            for name, task in self.tasks.items()
+            if task.status == TaskStatus.PENDING
+        }
+        # Ready tasks as a heap: longest critical path first, then YAML order
+        ready_tasks = [(-self._priority.get(name, 0), self.tasks[name].task_number, name)
+                       for name, count in remaining_needs.items() if count == 0]
+        heapq.heapify(ready_tasks)
+        progress_changed = False
+        
+        # Shell tasks run on the event loop itself; only blocking calls
+        # (database, internal tasks) go to this pool
+        self.executor = _get_pool(min(self.concurrency, BLOCKING_WORKERS))
+        
+        loop = asyncio.get_running_loop()
+        self._wake_scheduler = lambda: loop.call_soon_threadsafe(done_queue.put_nowait, None)
+        
+        stop_watcher = _StopWatcher(self._stop_flag_path)
+        if stop_watcher.fd is not None:
+            def on_stop_watch_event():
+                stop_watcher.read_events()
+                if stop_watcher.triggered:
+                    done_queue.put_nowait(None)
+            
+            loop.add_reader(stop_watcher.fd, on_stop_watch_event)
         
         try:
             while True:
                 # Check for stop signal
-                if check_stop_flag(self.target_dir) or self.stop_event.is_set():
+                if self.stop_event.is_set() or stop_watcher.stop_requested():
                     self.logger.info("Stop signal received, cancelling remaining tasks")
-                    self._cancel_running_tasks(running_tasks)
+                    await self._cancel_running_tasks(running_tasks)
+                    running_tasks.clear()
                     break
                 
-                # Find ready tasks
-                ready_tasks = []
-                for task_name, task in self.tasks.items():
-                    if (task.status == TaskStatus.PENDING and 
-                        task.is_ready(completed_tasks) and
-                        task_name not in running_tasks):
-                        ready_tasks.append(task)
-                    elif task.status == TaskStatus.PENDING:
-                        # Debug: log why task is not ready
-                        missing_deps = [dep for dep in task.needs if dep not in completed_tasks]
-                        if missing_deps:
-                            self.logger.debug(f"Task {task_name} waiting for dependencies: {missing_deps}")
-                        elif task_name in running_tasks:
-                            self.logger.debug(f"Task {task_name} already running")
-                
                 # Start ready tasks (up to concurrency limit)
-                available_slots = self.concurrency - len(running_tasks)
-                for task in ready_tasks[:available_slots]:
-                    future = self.executor.submit(self._execute_task, task)
+                while ready_tasks and len(running_tasks) < self.concurrency:
+                    task = self.tasks[heapq.heappop(ready_tasks)[2]]
+                    future = asyncio.ensure_future(self._execute_task_async(task))
                     running_tasks[task.name] = (task, future)
                     task.status = TaskStatus.RUNNING
                     self.logger.info(f"Started task: {task.name}")
+                    future.add_done_callback(lambda f, name=task.name: done_queue.put_nowait(name))
                 
-                # Check completed tasks
-                completed_futures = []
-                for task_name, (task, future) in running_tasks.items():
-                    if future.done():
-                        try:
-                            success = future.result()
-                            if success:
-                                task.status = TaskStatus.DONE
-                                completed_tasks.add(task_name)
-                                self.logger.info(f"Task completed successfully: {task_name}")
-                            else:
-                                task.status = TaskStatus.ERROR
-                                failed_tasks.add(task_name)
-                                self.logger.error(f"Task failed: {task_name}")
-                        except Exception as e:
-                            task.status = TaskStatus.ERROR
-                            failed_tasks.add(task_name)
-                            self.logger.error(f"Task {task_name} failed with exception: {e}")
-                        
-                        completed_futures.append(task_name)
-                        self._update_progress()
-                
-                # Remove completed tasks
-                for task_name in completed_futures:
-                    del running_tasks[task_name]
+                # Progress is written only after freed slots have been refilled,
+                # so newly ready tasks don't wait on the file/database update
+                if progress_changed:
+                    # A write skipped by the rate limit is retried on the
+                    # next wakeup
+                    progress_changed = not self._update_progress()
                 
                 # Check if we're done
-                if not running_tasks and not ready_tasks:
+                if not running_tasks:
                     break
                 
-                # Sleep briefly
-                time.sleep(0.1)
+                # Wait for the next task to finish or a stop request. The
+                # loop only wakes up on its own to retry a rate-limited
+                # progress write, or to poll the stop flag without inotify.
+                timeout = PROGRESS_WRITE_INTERVAL if progress_changed else None
+                if stop_watcher.fd is None:
+                    timeout = min(timeout or STOP_FLAG_POLL_INTERVAL, STOP_FLAG_POLL_INTERVAL)
+                try:
+                    finished = [await asyncio.wait_for(done_queue.get(), timeout)]
+                except asyncio.TimeoutError:
+                    continue
+                
+                # Reap everything that finished meanwhile in the same pass, so
+                # a burst of completions releases its dependents as one wave
+                while not done_queue.empty():
+                    finished.append(done_queue.get_nowait())
+                
+                for task_name in finished:
+                    if task_name is None:
+                        continue
+                    task, future = running_tasks.pop(task_name)
+                    try:
+                        success = future.result()
+                        if success:
+                            task.status = TaskStatus.DONE
+                            completed_tasks.add(task_name)
+                            if self.logger.isEnabledFor(logging.INFO):
+                                self.logger.info(f"Task completed successfully: {task_name}")
+                        else:
+                            task.status = TaskStatus.ERROR
+                            failed_tasks.add(task_name)
+                            self.logger.error(f"Task failed: {task_name}")
+                    except Exception as e:
+                        success = False
+                        task.status = TaskStatus.ERROR
+                        failed_tasks.add(task_name)
+                        self.logger.error(f"Task {task_name} failed with exception: {e}")
+                    
+                    # Release dependents whose last unfinished dependency this was
+                    if success:
+                        for dependent in self.dependents.get(task_name, ()):
+                            if dependent in remaining_needs:
+                                remaining_needs[dependent] -= 1
+                                if remaining_needs[dependent] == 0:
+                                    heapq.heappush(ready_tasks, (
+                                        -self._priority.get(dependent, 0),
+                                        self.tasks[dependent].task_number,
+                                        dependent,
+                                    ))
+                
+                progress_changed = True
         
         finally:
-            self.executor.shutdown(wait=True)
+            self._wake_scheduler = None
+            if stop_watcher.fd is not None:
+                loop.remove_reader(stop_watcher.fd)
+            stop_watcher.close()
+            
+            # Let cancelled tasks unwind (closing their log files) before the
+            # loop goes away. The shared pool stays up for the next run.
+            pending = [future for future in asyncio.all_tasks()
+                       if future is not asyncio.current_task()]
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            # Calls whose awaiting task was cancelled still run to completion
+            if self._blocking_futures:
+                futures.wait(list(self._blocking_futures))
+        
+        # Tasks left waiting on failed or filtered-out dependencies
+        for task_name, count in remaining_needs.items():
+            if count:
+                missing_deps = [dep for dep in self.tasks[task_name].needs
+                                if dep not in completed_tasks]
+                self.logger.debug(f"Task {task_name} not run, unmet dependencies: {missing_deps}")
         
         # Check final status
         total_tasks = len(self.tasks)
@@ -412,7 +1061,15 @@ class TaskRunner:
         
         return failed_count == 0
     
-    def _execute_task(self, task: Task) -> bool:
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call on the worker pool without stalling the event loop."""
+        future = self.executor.submit(func, *args, **kwargs)
+        # Tracked so the pipeline can drain them; the pool itself is shared
+        self._blocking_futures.add(future)
+        future.add_done_callback(self._blocking_futures.discard)
+        return await asyncio.wrap_future(future)
+    
+    async def _execute_task_async(self, task: Task) -> bool:
         """
         Execute a single task.
         
@@ -426,7 +1083,8 @@ class TaskRunner:
         
         # Start task in database (if available)
         if self.use_database:
-            task.task_id = self._safe_db_call(
+            task.task_id = await self._run_blocking(
+                self._safe_db_call,
                 "start_task",
                 self.run_id,
                 task.name,
@@ -440,10 +1098,10 @@ class TaskRunner:
             self._log_file_event("INFO", f"Starting task: {task.description}", task.name)
         
         try:
-            if task.is_internal():
-                return self._execute_internal_task(task)
+            if task.is_internal() or task.is_builtin():
+                return await self._run_blocking(self._execute_internal_task, task)
             else:
-                return self._execute_shell_task(task)
+                return await self._execute_shell_task_async(task)
         
         except Exception as e:
             self.logger.error(f"Task {task.name} failed with exception: {e}")
@@ -458,63 +1116,49 @@ class TaskRunner:
         finally:
             task.end_time = datetime.now(timezone.utc)
     
-    def _execute_shell_task(self, task: Task) -> bool:
+    async def _execute_shell_task_async(self, task: Task) -> bool:
         """Execute a shell command task."""
-        # Debug: log variables and original command
-        self.logger.debug(f"Variables for {task.name}: {self.variables}")
-        self.logger.debug(f"Original command: {task.cmd}")
-        
         # Render command
-        cmd = render_task_command(task.cmd, self.variables)
+        cmd = render_compiled(task.cmd_plan, self.variables)
         
-        # Debug: log rendered command
-        self.logger.debug(f"Rendered command: {cmd}")
+        # Debug: log variables, original and rendered command. Formatting the
+        # whole variable dict is costly, so skip it unless it gets written.
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Variables for {task.name}: {self.variables}")
+            self.logger.debug(f"Original command: {task.cmd}")
+            self.logger.debug(f"Rendered command: {cmd}")
         
         # Setup log files
-        log_dir = config.logs_dir(self.target) / "tareas"
-        log_dir.mkdir(exist_ok=True)
-        
-        stdout_path = log_dir / f"{task.task_number:02d}_{task.name}_stdout.log"
-        stderr_path = log_dir / f"{task.task_number:02d}_{task.name}_stderr.log"
+        stdout_path = self._logs_task_dir / f"{task.task_number:02d}_{task.name}_stdout.log"
+        stderr_path = self._logs_task_dir / f"{task.task_number:02d}_{task.name}_stderr.log"
         
         self.logger.info(f"Executing task {task.name}: {cmd}")
         
         try:
-            # Start process
-            with open(stdout_path, 'w', encoding='utf-8') as stdout_f, \
-                 open(stderr_path, 'w', encoding='utf-8') as stderr_f:
+            # Start process. The child writes straight to the inherited fds,
+            # so the parent only needs raw, unbuffered handles
+            with open(stdout_path, 'wb', buffering=0) as stdout_f, \
+                 open(stderr_path, 'wb', buffering=0) as stderr_f:
                 
-                # Determine shell based on OS
-                if os.name == 'nt':  # Windows
-                    process = subprocess.Popen(
-                        cmd,
-                        shell=True,
-                        stdout=stdout_f,
-                        stderr=stderr_f,
-                        env=self.variables,
-                        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
-                    )
-                else:  # Unix-like
-                    process = subprocess.Popen(
-                        cmd,
-                        shell=True,
-                        stdout=stdout_f,
-                        stderr=stderr_f,
-                        env=self.variables,
-                        preexec_fn=os.setsid
-                    )
+                if task.is_pipe():
+                    argvs = [[render_compiled(plan, self.variables) for plan in argv]
+                             for argv in task.cmds_plan]
+                    process = await _spawn_chain_impl(argvs, stdout_f, stderr_f, self._env)
+                else:
+                    process = await _spawn_impl(cmd, stdout_f, stderr_f, self._env)
                 
                 task.process = process
                 
                 # Wait for completion with timeout
                 timeout = task.timeout or config.DEFAULT_TIMEOUT
                 try:
-                    return_code = process.wait(timeout=timeout)
+                    return_code = await asyncio.wait_for(process.wait(), timeout)
                     task.return_code = return_code
                     
                     # Update database and state
                     status = TaskStatus.DONE if return_code == 0 else TaskStatus.ERROR
                     if self.use_database and task.task_id:
+                        # Only queues the update for the database writer
                         self._safe_db_call(
                             "end_task",
                             task.task_id,
@@ -534,9 +1178,9 @@ class TaskRunner:
                     
                     return return_code == 0
                 
-                except subprocess.TimeoutExpired:
+                except asyncio.TimeoutError:
                     self.logger.warning(f"Task {task.name} timed out after {timeout} seconds")
-                    self._kill_process_tree(process)
+                    await self._terminate_process_tree(process)
                     if self.use_database and task.task_id:
                         self._safe_db_call("end_task", task.task_id, TaskStatus.ERROR, -1, str(stdout_path), str(stderr_path))
                     else:
@@ -556,11 +1200,14 @@ class TaskRunner:
             return False
     
     def _execute_internal_task(self, task: Task) -> bool:
-        """Execute an internal task."""
+        """Execute an internal or builtin task in-process."""
         self.logger.info(f"Executing internal task {task.name}: {task.kind}")
         
         try:
-            if task.kind == TaskKind.INTERNAL_SUMMARIZE.value:
+            if task.is_builtin():
+                BUILTIN_OPS[task.kind[len(BUILTIN_PREFIX):]](task.render_args(self.variables))
+            
+            elif task.kind == TaskKind.INTERNAL_SUMMARIZE.value:
                 from .summarizer import Summarizer
                 summarizer = Summarizer(self.target)
                 summarizer.generate_summary()
@@ -587,31 +1234,53 @@ class TaskRunner:
                 self._log_file_event("ERROR", f"Internal task failed: {e}", task.name)
             return False
     
-    def _kill_process_tree(self, process):
-        """Kill process and all its children."""
+    async def _terminate_process_tree(self, process):
+        """Kill a timed-out process and its children without blocking the event loop."""
         try:
-            if os.name == 'nt':  # Windows
-                process.terminate()
-                time.sleep(config.HARD_KILL_GRACE)
-                if process.poll() is None:
-                    process.kill()
-            else:  # Unix-like
-                # Kill process group
-                os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-                time.sleep(config.HARD_KILL_GRACE)
-                try:
-                    os.killpg(os.getpgid(process.pid), signal.SIGKILL)
-                except (ProcessLookupError, PermissionError):
-                    pass
+            _terminate_impl(process)
         except (ProcessLookupError, PermissionError):
-            pass
+            return
+        
+        try:
+            await asyncio.wait_for(process.wait(), config.HARD_KILL_GRACE)
+        except asyncio.TimeoutError:
+            try:
+                _kill_impl(process)
+            except (ProcessLookupError, PermissionError):
+                pass
+            await process.wait()
     
-    def _cancel_running_tasks(self, running_tasks):
-        """Cancel all running tasks."""
-        for task_name, (task, future) in running_tasks.items():
+    async def _cancel_running_tasks(self, running_tasks):
+        """
+        Cancel all running tasks.
+        
+        Every process tree is sent SIGTERM first and the survivors are killed
+        after a single HARD_KILL_GRACE period, so stopping takes about one
+        grace period however many tasks are running.
+        """
+        processes = []
+        for task, future in running_tasks.values():
             future.cancel()
-            if task.process:
-                self._kill_process_tree(task.process)
+            process = task.process
+            if process is not None and process.returncode is None:
+                try:
+                    _terminate_impl(process)
+                except (ProcessLookupError, PermissionError):
+                    continue
+                processes.append(process)
+        
+        if processes:
+            # Returns early once every shell has exited
+            await asyncio.wait([asyncio.ensure_future(process.wait()) for process in processes],
+                               timeout=config.HARD_KILL_GRACE)
+            # Children may outlive their shell, so kill each group regardless
+            for process in processes:
+                try:
+                    _kill_impl(process)
+                except (ProcessLookupError, PermissionError):
+                    pass
+        
+        for task, _ in running_tasks.values():
             task.status = TaskStatus.CANCELLED
             if self.use_database and task.task_id:
                 self._safe_db_call("end_task", task.task_id, TaskStatus.CANCELLED)
@@ -619,59 +1288,47 @@ class TaskRunner:
                 self.running_tasks.discard(task.name)
                 self._log_file_event("WARNING", f"Task cancelled", task.name)
     
-    def _update_progress(self):
-        """Update progress.json file."""
-        # Get run info from database or fallback to file-based tracking
-        run_info = None
-        if self.use_database and self.db and self.run_id:
-            run_info = self._safe_db_call("get_run", self.run_id)
+    def _update_progress(self, force: bool = False) -> bool:
+        """
+        Update progress.json file.
         
-        # Count completed tasks
-        if self.use_database and self.tasks:
-            completed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.DONE)
-        else:
-            completed = len(self.completed_tasks)
+        Args:
+            force: Write even if the last write was under PROGRESS_WRITE_INTERVAL ago
         
+        Returns:
+            True if the file was written or already up to date
+        """
+        completed = len(self.completed_tasks)
         total = len(self.tasks) if self.tasks else 0
         
-        # Find current running task
-        current_task = None
-        if self.use_database and self.tasks:
-            for task in self.tasks.values():
-                if task.status == TaskStatus.RUNNING:
-                    current_task = task.name
-                    break
-        else:
-            current_task = list(self.running_tasks)[0] if self.running_tasks else None
+        # Oldest still-running task
+        current_task = next(iter(self.active_tasks), None)
+        
+        # Nothing a reader cares about changed (e.g. a failed task was
+        # replaced by the next one), skip serializing and rewriting the file
+        state = (self.run_id, self.run_status, total, completed, current_task)
+        if not force and state == self._last_progress_state:
+            return True
+        
+        now = time.monotonic()
+        if not force and now - self._last_progress_write < PROGRESS_WRITE_INTERVAL:
+            return False
+        self._last_progress_write = now
+        self._last_progress_state = state
         
-        # Calculate ETA
+        # Calculate ETA from the average task rate so far
         eta_seconds = None
-        start_time_str = None
-        status = "running"
-        
-        if run_info:
-            start_time_str = run_info['start_ts']
-            status = run_info['status']
-            if start_time_str and completed > 0:
-                start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
-                if elapsed > 0:
-                    rate = completed / elapsed
-                    remaining = total - completed
-                    eta_seconds = int(remaining / rate) if rate > 0 and remaining > 0 else None
-        elif self.start_time and completed > 0:
-            start_time_str = self.start_time.isoformat()
-            elapsed = (datetime.now() - self.start_time).total_seconds()
-            if elapsed > 0:
-                rate = completed / elapsed
-                remaining = total - completed
-                eta_seconds = int(remaining / rate) if rate > 0 and remaining > 0 else None
+        if self._start_monotonic is not None and completed > 0:
+            elapsed = now - self._start_monotonic
+            remaining = total - completed
+            if elapsed > 0 and remaining > 0:
+                eta_seconds = int(remaining * elapsed / completed)
         
         progress_data = {
             "target": self.target,
             "run_id": self.run_id or 0,
-            "started": start_time_str,
-            "status": status,
+            "started": self.start_time.isoformat() if self.start_time else None,
+            "status": self.run_status.value,
             "total": total,
             "done": completed,
             "current_task": current_task,
@@ -679,11 +1336,16 @@ class TaskRunner:
             "last_update": datetime.now(timezone.utc).isoformat()
         }
         
-        write_json(config.progress_json_path(self.target), progress_data)
+        # The target directory was created in __init__
+        write_json(self._progress_path, progress_data, ensure_parents=False)
+        return True
     
     def stop(self):
         """Signal the runner to stop."""
         self.stop_event.set()
+        wake_scheduler = self._wake_scheduler
+        if wake_scheduler is not None:
+            wake_scheduler()
         # Also create stop flag file
         from .utils import create_stop_flag
         create_stop_flag(self.target_dir)
\ No newline at end of file
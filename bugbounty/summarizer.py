@@ -13,7 +13,8 @@ import glob
 from jsonpath_ng import parse as jsonpath_parse
 
 from .config import config
-from .utils import read_json, write_json, create_zip_archive, safe_filename, get_file_size_mb
+from .constants import FILTERS_CACHE, ZIP_EXCLUDE_PATTERNS
+from .utils import read_json, write_json, load_yaml, create_zip_archive, safe_filename, get_file_size_mb
 
 
 class JuicyFilter:
@@ -96,8 +97,7 @@ class Summarizer:
             self._create_default_filters()
         
         try:
-            with open(filters_file, 'r', encoding='utf-8') as f:
-                filters_config = yaml.safe_load(f)
+            filters_config = load_yaml(filters_file, filters_file.with_name(FILTERS_CACHE))
             
             self.filters = []
             for rule_config in filters_config.get('rules', []):
@@ -560,14 +560,8 @@ class Summarizer:
             "logs/runner.log"
         ]
         
-        exclude_patterns = [
-            "*.tmp",
-            "*.lock",
-            "__pycache__/**"
-        ]
-        
         try:
-            create_zip_archive(self.target_dir, zip_path, exclude_patterns)
+            create_zip_archive(self.target_dir, zip_path, ZIP_EXCLUDE_PATTERNS)
             return zip_path
         except Exception as e:
             print(f"Error creating ZIP archive: {e}")
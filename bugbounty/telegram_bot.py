@@ -15,7 +15,8 @@ from .config import config
 from .db import Database, init_db
 from .utils import read_json, tail_file, format_timestamp, format_duration, create_stop_flag
 from .summarizer import Summarizer
-from .notifier import TelegramNotifier
+from .notifier import TelegramNotifier, close_notifier
+from .constants import STATUS_EMOJI
 
 
 class BugBountyBot:
@@ -89,13 +90,7 @@ class BugBountyBot:
             message = f"🎯 **{target}** Status\n\n"
             
             status = progress_data.get('status', 'UNKNOWN')
-            status_emoji = {
-                'PENDING': '⏳',
-                'RUNNING': '🔄',
-                'DONE': '✅',
-                'ERROR': '❌',
-                'CANCELLED': '🛑'
-            }.get(status, '❓')
+            status_emoji = STATUS_EMOJI.get(status, '❓')
             
             message += f"**Status:** {status_emoji} {status}\n"
             
@@ -455,6 +450,7 @@ class BugBountyBot:
             if self.application:
                 await self.application.stop()
                 await self.application.shutdown()
+            close_notifier()
     
     def run_sync(self):
         """Run the bot synchronously."""
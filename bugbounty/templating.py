@@ -5,13 +5,27 @@ Handles YAML task templating with environment variables and path resolution.
 
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from jinja2 import Template, Environment, BaseLoader
 
 from .config import config
 
 
+# {VAR} placeholders handled by the simple substitution pass
+VAR_PATTERN = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Text that may contain Jinja2 syntax and needs the second rendering pass
+JINJA_MARKERS = ('{{', '{%', '{#')
+
+# A compiled template segment: (literal text, None) or (None, variable name)
+Segment = Tuple[Optional[str], Optional[str]]
+
+# Distinct Jinja2 sources kept compiled by TemplateRenderer
+JINJA_CACHE_SIZE = 256
+
+
 class StringTemplateLoader(BaseLoader):
     """Simple string template loader for Jinja2."""
     
@@ -27,6 +41,9 @@ class TemplateRenderer:
     
     def __init__(self):
         self.env = Environment(loader=BaseLoader())
+        # Parsing dominates Jinja2 rendering; sources repeat across tasks and
+        # materialize_env() iterations, so keep them compiled
+        self._compile_jinja = lru_cache(maxsize=JINJA_CACHE_SIZE)(self.env.from_string)
     
     def render(self, text: str, variables: Dict[str, Any]) -> str:
         """Render text with variable substitution."""
@@ -39,15 +56,20 @@ class TemplateRenderer:
             pattern = f"{{{key}}}"
             result = result.replace(pattern, str(value))
         
-        # Second pass: Jinja2 template rendering for advanced features
+        # Second pass: Jinja2 template rendering for advanced features, only
+        # needed when there is Jinja2 syntax left
+        if any(marker in result for marker in JINJA_MARKERS):
+            result = self.render_jinja(result, variables)
+        return result
+    
+    def render_jinja(self, text: str, variables: Dict[str, Any]) -> str:
+        """Render Jinja2 syntax in text, returning it unchanged if rendering fails."""
         try:
-            template = self.env.from_string(result)
-            result = template.render(**variables)
+            template = self._compile_jinja(text)
+            return template.render(**variables)
         except Exception:
-            # If Jinja2 fails, return the simple substitution result
-            pass
-        
-        return result
+            # If Jinja2 fails, return the text as is
+            return text
     
     def render_dict(self, data: Dict[str, Any], variables: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively render all string values in a dictionary."""
@@ -124,6 +146,61 @@ def materialize_env(target: str, custom_vars: Optional[Dict[str, Any]] = None) -
     return variables
 
 
+def compile_template(text: str) -> Tuple[Segment, ...]:
+    """
+    Split a template into literal text and {VAR} placeholders.
+    
+    The result is meant to be computed once and rendered many times with
+    render_compiled().
+    
+    Args:
+        text: Template string
+    
+    Returns:
+        Tuple of (literal, None) and (None, variable name) segments
+    """
+    segments: List[Segment] = []
+    position = 0
+    
+    for match in VAR_PATTERN.finditer(text or ""):
+        if match.start() > position:
+            segments.append((text[position:match.start()], None))
+        segments.append((None, match.group(1)))
+        position = match.end()
+    
+    if text and position < len(text):
+        segments.append((text[position:], None))
+    
+    return tuple(segments)
+
+
+def render_compiled(plan: Tuple[Segment, ...], variables: Dict[str, Any]) -> str:
+    """
+    Render a compiled template with variable substitution.
+    
+    Unknown placeholders are left in place. The Jinja2 pass only runs when
+    the substituted text contains Jinja2 syntax.
+    
+    Args:
+        plan: Segments from compile_template()
+        variables: Variable dictionary
+    
+    Returns:
+        Rendered string
+    """
+    result = "".join(
+        literal if name is None
+        else str(variables[name]) if name in variables
+        else f"{{{name}}}"
+        for literal, name in plan
+    )
+    
+    if any(marker in result for marker in JINJA_MARKERS):
+        result = renderer.render_jinja(result, variables)
+    
+    return result
+
+
 def render_task_command(cmd: str, variables: Dict[str, str]) -> str:
     """
     Render a task command with variable substitution.
@@ -135,8 +212,22 @@ def render_task_command(cmd: str, variables: Dict[str, str]) -> str:
     Returns:
         Rendered command string
     """
-    renderer = TemplateRenderer()
-    return renderer.render(cmd, variables)
+    return render_compiled(compile_template(cmd), variables)
+
+
+def missing_template_vars(plan: Tuple[Segment, ...], available_vars: Dict[str, Any]) -> list:
+    """
+    Get the placeholders of a compiled template that have no value.
+    
+    Args:
+        plan: Segments from compile_template()
+        available_vars: Available variables
+    
+    Returns:
+        List of missing variable names
+    """
+    required_vars = {name for _, name in plan if name is not None}
+    return list(required_vars - available_vars.keys())
 
 
 def validate_template_vars(text: str, available_vars: Dict[str, str]) -> list:
@@ -150,16 +241,7 @@ def validate_template_vars(text: str, available_vars: Dict[str, str]) -> list:
     Returns:
         List of missing variable names
     """
-    if not text:
-        return []
-    
-    # Find all {VAR} patterns
-    pattern = r'\{([A-Za-z_][A-Za-z0-9_]*)\}'
-    required_vars = set(re.findall(pattern, text))
-    available_vars_set = set(available_vars.keys())
-    
-    missing_vars = required_vars - available_vars_set
-    return list(missing_vars)
+    return missing_template_vars(compile_template(text), available_vars)
 
 
 def escape_shell_arg(arg: str) -> str:
@@ -9,10 +9,20 @@ import gzip
 import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple, Union
+from collections import deque
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
 import os
+import pickle
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    # LibYAML bindings not available
+    from yaml import SafeLoader
 
 try:
     import fcntl
@@ -21,17 +31,27 @@ except ImportError:
     # fcntl is not available on Windows
     HAS_FCNTL = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    # orjson is optional, fall back to the stdlib encoder/decoder
+    HAS_ORJSON = False
+
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
+from rich.text import Text
 
 
 console = Console()
 
 
 class FileLock:
-    """Simple file-based locking mechanism."""
+    """
+    Simple file-based locking mechanism.
+    
+    Uses fcntl.flock where available, so a lock held by a crashed process
+    is released by the kernel; falls back to exclusive file creation.
+    """
     
     def __init__(self, lock_file: Path, timeout: int = 30):
         self.lock_file = lock_file
@@ -47,27 +67,70 @@ class FileLock:
     
     def acquire(self):
         """Acquire the lock with timeout."""
-        start_time = time.time()
+        deadline = time.monotonic() + self.timeout
+        delay = 0.005
         
-        while time.time() - start_time < self.timeout:
-            try:
-                # Use exclusive file creation for cross-platform locking
-                self.fd = os.open(str(self.lock_file), os.O_CREAT | os.O_EXCL | os.O_RDWR)
+        while True:
+            if HAS_FCNTL:
+                acquired = self._try_flock()
+            else:
+                acquired = self._try_create()
+            if acquired:
                 return
-            except FileExistsError:
-                time.sleep(0.1)
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Short back-off so a lock released by an exiting process is picked up quickly
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.1)
         
         raise TimeoutError(f"Could not acquire lock {self.lock_file} within {self.timeout} seconds")
     
+    def _try_flock(self) -> bool:
+        """Try to take a non-blocking flock on the lock file."""
+        fd = os.open(str(self.lock_file), os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # The previous holder may have unlinked the file after we opened it
+            if os.fstat(fd).st_ino == os.stat(self.lock_file).st_ino:
+                self.fd = fd
+                return True
+        except (BlockingIOError, FileNotFoundError):
+            pass
+        os.close(fd)
+        return False
+    
+    def _try_create(self) -> bool:
+        """Try to create the lock file exclusively."""
+        try:
+            # Use exclusive file creation for cross-platform locking
+            self.fd = os.open(str(self.lock_file), os.O_CREAT | os.O_EXCL | os.O_RDWR)
+            return True
+        except FileExistsError:
+            return False
+    
     def release(self):
         """Release the lock."""
-        if self.fd is not None:
+        if self.fd is None:
+            return
+        
+        if HAS_FCNTL:
+            # Unlink while still holding the lock so waiters re-check the inode
+            try:
+                os.unlink(self.lock_file)
+            except FileNotFoundError:
+                pass
+            os.close(self.fd)
+        else:
+            # Windows can't unlink a file that is still open; the file's
+            # existence is the lock here, so close first
             os.close(self.fd)
-            self.fd = None
             try:
                 os.unlink(self.lock_file)
             except FileNotFoundError:
                 pass
+        self.fd = None
 
 
 @contextmanager
@@ -81,7 +144,7 @@ def file_lock(lock_file: Path, timeout: int = 30):
         lock.release()
 
 
-def read_json(file_path: Path, default: Any = None) -> Any:
+def read_json(file_path: Union[str, Path], default: Any = None) -> Any:
     """
     Read JSON file with error handling.
     
@@ -93,15 +156,98 @@ def read_json(file_path: Path, default: Any = None) -> Any:
         Parsed JSON data or default value
     """
     try:
-        if not file_path.exists():
-            return default
+        if HAS_ORJSON:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
         
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
-    except (json.JSONDecodeError, IOError):
+    except (ValueError, IOError):
+        # orjson.JSONDecodeError and json.JSONDecodeError are both ValueErrors;
+        # a missing file is an IOError
         return default
 
 
+# Parsed YAML documents keyed by (path, mtime_ns, size)
+_yaml_cache: Dict[Tuple[str, int, int], Any] = {}
+
+# Bump when the sidecar cache layout changes
+YAML_CACHE_VERSION = 1
+
+
+def _read_yaml_sidecar(cache_path: Path, mtime_ns: int, size: int) -> Tuple[bool, Any]:
+    """Read a pickled YAML sidecar if it matches the source file version."""
+    try:
+        with open(cache_path, 'rb') as f:
+            version, cached_mtime_ns, cached_size, data = pickle.load(f)
+    except Exception:
+        return False, None
+    
+    if (version, cached_mtime_ns, cached_size) != (YAML_CACHE_VERSION, mtime_ns, size):
+        return False, None
+    return True, data
+
+
+def _write_yaml_sidecar(cache_path: Path, mtime_ns: int, size: int, data: Any):
+    """Write a pickled YAML sidecar atomically, ignoring failures."""
+    temp_file = cache_path.with_suffix('.tmp')
+    try:
+        with open(temp_file, 'wb') as f:
+            pickle.dump((YAML_CACHE_VERSION, mtime_ns, size, data), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        temp_file.replace(cache_path)
+    except Exception:
+        # The sidecar is only an optimization
+        try:
+            temp_file.unlink()
+        except OSError:
+            pass
+
+
+def load_yaml(file_path: Path, cache_path: Optional[Path] = None) -> Any:
+    """
+    Load a YAML file, reusing the parsed result while the file is unchanged.
+    
+    The returned object is shared between callers and must not be mutated.
+    
+    Args:
+        file_path: Path to YAML file
+        cache_path: Optional pickle sidecar used to skip parsing across processes
+    
+    Returns:
+        Parsed YAML data
+    
+    Raises:
+        OSError: If the file cannot be read
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    st = os.stat(file_path)
+    key = (str(file_path), st.st_mtime_ns, st.st_size)
+    
+    try:
+        return _yaml_cache[key]
+    except KeyError:
+        pass
+    
+    found = False
+    if cache_path is not None:
+        found, data = _read_yaml_sidecar(cache_path, st.st_mtime_ns, st.st_size)
+    
+    if not found:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        
+        if cache_path is not None:
+            _write_yaml_sidecar(cache_path, st.st_mtime_ns, st.st_size, data)
+    
+    # Drop stale entries for this path before caching the new version
+    for stale in [k for k in _yaml_cache if k[0] == key[0]]:
+        del _yaml_cache[stale]
+    _yaml_cache[key] = data
+    
+    return data
+
+
 def write_json(file_path: Path, data: Any, ensure_parents: bool = True):
     """
     Write JSON file atomically.
@@ -117,8 +263,13 @@ def write_json(file_path: Path, data: Any, ensure_parents: bool = True):
     # Write to temporary file first, then move
     temp_file = file_path.with_suffix('.tmp')
     try:
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if HAS_ORJSON:
+            temp_file.write_bytes(
+                orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         
         # Atomic move
         temp_file.replace(file_path)
@@ -190,12 +341,47 @@ def calculate_eta(start_time: datetime, completed: int, total: int) -> Optional[
     return int(remaining / rate) if rate > 0 else None
 
 
-def create_progress_bar(description: str = "Processing"):
-    """Create a rich progress bar."""
+class PlainProgress:
+    """
+    Stand-in for rich's Progress on non-interactive output.
+    
+    Prints one line per description instead of running a spinner refresh thread.
+    """
+    
+    def __init__(self, output: Console):
+        self.console = output
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+    
+    def add_task(self, description: str, **kwargs) -> int:
+        self.console.print(description)
+        return 0
+    
+    def update(self, task_id: int, description: Optional[str] = None, **kwargs):
+        if description:
+            self.console.print(description)
+
+
+def create_progress_bar(description: str = "Processing", output: Optional[Console] = None):
+    """
+    Create a rich progress bar, or a plain line printer when not on a TTY.
+    
+    Set BB_NO_PROGRESS to force the plain variant.
+    """
+    output = output or console
+    if not output.is_terminal or os.getenv("BB_NO_PROGRESS"):
+        return PlainProgress(output)
+    
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
     return Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=output
     )
 
 
@@ -205,6 +391,8 @@ def print_status_table(data: List[Dict[str, str]], title: str = "Status"):
         console.print(f"[yellow]No {title.lower()} data available[/yellow]")
         return
     
+    from rich.table import Table
+    
     table = Table(title=title, show_header=True, header_style="bold magenta")
     
     # Add columns based on first row
@@ -219,8 +407,10 @@ def print_status_table(data: List[Dict[str, str]], title: str = "Status"):
     console.print(table)
 
 
-def print_panel(content: str, title: str = None, style: str = "blue"):
+def print_panel(content: Union[str, Text], title: str = None, style: str = "blue"):
     """Print content in a panel."""
+    from rich.panel import Panel
+    
     console.print(Panel(content, title=title, border_style=style))
 
 
@@ -259,30 +449,130 @@ def compress_file(source_path: Path, output_path: Path):
             f_out.writelines(f_in)
 
 
+# Files up to this size are read ahead in worker threads while zipping
+ZIP_PREFETCH_LIMIT = 1024 * 1024
+# The read-ahead window holds at most this many files and this many bytes
+ZIP_PREFETCH_DEPTH = 128
+ZIP_PREFETCH_BUDGET = 4 * 1024 * 1024
+
+
+def _iter_archive_files(source_dir: Path):
+    """
+    Yield regular files under a directory without following directory symlinks.
+    
+    Yields:
+        (path, size in bytes) tuples
+    """
+    pending = [os.fspath(source_dir)]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    try:
+                        size = entry.stat().st_size
+                    except OSError:
+                        continue
+                    yield Path(entry.path), size
+
+
+def _prefetch_file(file_path: Path) -> Optional[bytes]:
+    """Read a small file into memory, or return None to stream it instead."""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read(ZIP_PREFETCH_LIMIT + 1)
+    except OSError:
+        return None
+    return data if len(data) <= ZIP_PREFETCH_LIMIT else None
+
+
 def create_zip_archive(source_dir: Path, output_path: Path, exclude_patterns: List[str] = None):
     """
     Create a ZIP archive from a directory.
     
+    Small files are read ahead on a thread pool so disk reads overlap
+    with compression, keeping at most ZIP_PREFETCH_BUDGET bytes in memory;
+    larger files are streamed by zipfile as before.
+    
     Args:
         source_dir: Source directory path
         output_path: Output ZIP file path
         exclude_patterns: File patterns to exclude
     """
     exclude_patterns = exclude_patterns or []
+    output_abs = os.path.abspath(output_path)
+    
+    pending = deque(
+        (file_path, size) for file_path, size in _iter_archive_files(source_dir)
+        if os.path.abspath(file_path) != output_abs
+        and not any(file_path.match(pattern) for pattern in exclude_patterns)
+    )
+    
+    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf, \
+         ThreadPoolExecutor(max_workers=4) as executor:
+        # (path, bytes reserved, prefetch future or None to stream)
+        window = deque()
+        buffered = 0
+        
+        while window or pending:
+            # Top up the read-ahead window within its file and byte budgets
+            while pending and len(window) < ZIP_PREFETCH_DEPTH:
+                file_path, size = pending[0]
+                if size > ZIP_PREFETCH_LIMIT:
+                    reserved, future = 0, None
+                elif window and buffered + size > ZIP_PREFETCH_BUDGET:
+                    break
+                else:
+                    reserved, future = size, executor.submit(_prefetch_file, file_path)
+                pending.popleft()
+                window.append((file_path, reserved, future))
+                buffered += reserved
+            
+            file_path, reserved, future = window.popleft()
+            buffered -= reserved
+            
+            arcname = file_path.relative_to(source_dir)
+            data = future.result() if future is not None else None
+            if data is None:
+                zipf.write(file_path, arcname)
+            else:
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                zipf.writestr(zinfo, data, compress_type=zipfile.ZIP_DEFLATED)
+
+
+def parallel_rmtree(path: Path, max_workers: int = 16):
+    """
+    Remove a directory tree, unlinking files from a thread pool.
+    
+    Args:
+        path: Directory to remove
+        max_workers: Number of unlink worker threads
+    """
+    files = []
+    dirs = []
+    
+    # Collect entries top-down; symlinks are unlinked, never followed
+    pending = [os.fspath(path)]
+    while pending:
+        current = pending.pop()
+        dirs.append(current)
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    files.append(entry.path)
+    
+    if files:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the iterator so unlink errors are raised here
+            for _ in executor.map(os.unlink, files):
+                pass
     
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in source_dir.rglob('*'):
-            if file_path.is_file():
-                # Check if file should be excluded
-                should_exclude = False
-                for pattern in exclude_patterns:
-                    if file_path.match(pattern):
-                        should_exclude = True
-                        break
-                
-                if not should_exclude:
-                    arcname = file_path.relative_to(source_dir)
-                    zipf.write(file_path, arcname)
+    # Children were appended after their parents
+    for directory in reversed(dirs):
+        os.rmdir(directory)
 
 
 def check_stop_flag(target_dir: Path) -> bool:
@@ -348,7 +638,7 @@ def get_file_size_mb(file_path: Path) -> float:
         File size in MB
     """
     try:
-        return file_path.stat().st_size / (1024 * 1024)
+        return file_path.stat().st_size / 1048576
     except (OSError, FileNotFoundError):
         return 0.0
 
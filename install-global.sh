@@ -43,9 +43,9 @@ echo -e "${BLUE}📦 Step 2: Python packages${NC}"
 # Upgrade pip
 python3 -m pip install --upgrade pip $INSTALL_FLAG
 
-# Install dependencies globally
+# Install dependencies globally (requirements.txt is the single source of truth)
 echo "Installing r0tbb dependencies..."
-python3 -m pip install $INSTALL_FLAG typer rich python-dotenv pyyaml jinja2 peewee psutil jsonpath-ng python-telegram-bot aiofiles
+python3 -m pip install $INSTALL_FLAG -r "$(dirname "$0")/requirements.txt"
 
 # Install the tool
 echo "Installing r0tbb..."
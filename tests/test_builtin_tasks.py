@@ -0,0 +1,104 @@
+"""
+Tests for builtin tasks (kind: builtin:<op>) run by TaskRunner.
+"""
+
+import pytest
+
+from bugbounty.config import config
+from bugbounty.constants import TaskStatus
+from bugbounty.runner import TaskRunner
+
+
+@pytest.fixture
+def target(tmp_path, monkeypatch):
+    """A fresh target directory under a temporary ROOT_DIR."""
+    monkeypatch.setattr(config, "ROOT_DIR", tmp_path)
+    monkeypatch.setattr(config, "_target_paths", {})
+    config.ensure_target_structure("example.com")
+    return "example.com"
+
+
+@pytest.fixture
+def outputs(target):
+    """The target's outputs directory."""
+    return config.for_target(target).outputs_dir
+
+
+def run_pipeline(target, pipeline_yaml):
+    """Run a pipeline without the database and return (success, tasks by name)."""
+    config.tasks_yaml_path(target).write_text(pipeline_yaml)
+    runner = TaskRunner(target, use_database=False)
+    success = runner.run()
+    return success, {name: task for name, task in runner.tasks.items()}
+
+
+def test_dedup_in_place(target, outputs):
+    (outputs / "hosts.txt").write_text("b\na\n\nb\nc\na\n")
+    success, tasks = run_pipeline(target, """
+pipeline:
+  - name: dedup
+    kind: builtin:dedup
+    args:
+      inputs: "{OUT}/outputs/hosts.txt"
+      output: "{OUT}/outputs/hosts.txt"
+""")
+    assert success
+    assert tasks["dedup"].status == TaskStatus.DONE
+    assert (outputs / "hosts.txt").read_text() == "b\na\nc\n"
+    assert not (outputs / "hosts.txt.tmp").exists()
+
+
+def test_grep_in_place(target, outputs):
+    (outputs / "urls.txt").write_text("https://a/x.js\nhttps://a/y.css\nhttps://b/z.js\n")
+    success, _ = run_pipeline(target, """
+pipeline:
+  - name: js
+    kind: builtin:grep
+    args:
+      inputs: ["{OUT}/outputs/urls.txt"]
+      output: "{OUT}/outputs/urls.txt"
+      pattern: "\\\\.js$"
+""")
+    assert success
+    assert (outputs / "urls.txt").read_text() == "https://a/x.js\nhttps://b/z.js\n"
+
+
+def test_args_are_rendered(target, outputs):
+    success, _ = run_pipeline(target, """
+pipeline:
+  - name: write
+    kind: builtin:write
+    args:
+      output: "{OUT}/outputs/{TARGET}.txt"
+      text: "scope: {TARGET}"
+""")
+    assert success
+    assert (outputs / "example.com.txt").read_text() == "scope: example.com"
+
+
+def test_missing_input_fails_task(target, outputs):
+    success, tasks = run_pipeline(target, """
+pipeline:
+  - name: cat
+    kind: builtin:cat
+    args:
+      inputs: ["{OUT}/outputs/missing.txt"]
+      output: "{OUT}/outputs/all.txt"
+""")
+    assert not success
+    assert tasks["cat"].status == TaskStatus.ERROR
+    assert not (outputs / "all.txt").exists()
+    assert not (outputs / "all.txt.tmp").exists()
+
+
+def test_failing_op_fails_task(target):
+    success, tasks = run_pipeline(target, """
+pipeline:
+  - name: grep
+    kind: builtin:grep
+    args:
+      inputs: ["{OUT}/outputs/urls.txt"]
+      output: "{OUT}/outputs/js.txt"
+""")
+    assert not success
+    assert tasks["grep"].status == TaskStatus.ERROR
@@ -0,0 +1,73 @@
+"""
+Tests for the database's background writer.
+"""
+
+import sqlite3
+
+import pytest
+
+from bugbounty import db as db_module
+from bugbounty.db import Database
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A fresh database that gives up quickly on a held lock."""
+    monkeypatch.setattr(db_module, "BUSY_TIMEOUT", 0.1)
+    database = Database(tmp_path / "test.db")
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def write_lock(database):
+    """Hold the database's write lock from a second connection."""
+    conn = sqlite3.connect(database.db_path, isolation_level=None)
+    conn.execute("BEGIN IMMEDIATE")
+    yield
+    conn.execute("ROLLBACK")
+    conn.close()
+
+
+def test_write_fails_under_held_lock(database, write_lock):
+    with pytest.raises(sqlite3.OperationalError):
+        database.start_run("example.com")
+
+
+def test_batched_writes_all_fail_under_held_lock(database, write_lock):
+    futures = [
+        database._submit_write(database._start_run, "example.com", 0, None, db_module._now_iso())
+        for _ in range(5)
+    ]
+    for future in futures:
+        with pytest.raises(sqlite3.OperationalError):
+            future.result(timeout=10)
+
+
+def test_writes_resume_after_lock_released(database):
+    conn = sqlite3.connect(database.db_path, isolation_level=None)
+    conn.execute("BEGIN IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError):
+        database.start_run("example.com")
+    conn.execute("ROLLBACK")
+    conn.close()
+    
+    run_id = database.start_run("example.com")
+    assert database.get_run(run_id)["target"] == "example.com"
+
+
+def test_event_paging_keeps_events_sharing_a_timestamp(database, monkeypatch):
+    run_id = database.start_run("example.com")
+    monkeypatch.setattr(db_module, "_now_iso", lambda: "2999-01-01T00:00:00.000000+00:00")
+    for i in range(7):
+        database.log_event(run_id, message=f"event {i}")
+    
+    messages = []
+    page = database.get_run_events(run_id, limit=3)
+    while page:
+        messages.extend(event["message"] for event in page)
+        last = page[-1]
+        page = database.get_run_events(run_id, limit=3, before=(last["ts"], last["id"]))
+    
+    assert messages[:7] == [f"event {i}" for i in reversed(range(7))]
+    assert messages[7:] == ["Run started for target: example.com"]
@@ -0,0 +1,71 @@
+"""
+Tests for pipe tasks (kind: pipe) run by TaskRunner.
+"""
+
+import os
+
+import pytest
+
+from bugbounty.config import config
+from bugbounty.runner import TaskRunner
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason="uses POSIX tools")
+
+
+@pytest.fixture
+def target(tmp_path, monkeypatch):
+    """A fresh target directory under a temporary ROOT_DIR."""
+    monkeypatch.setattr(config, "ROOT_DIR", tmp_path)
+    monkeypatch.setattr(config, "_target_paths", {})
+    config.ensure_target_structure("example.com")
+    return "example.com"
+
+
+def run_pipeline(target, pipeline_yaml):
+    """Run a pipeline without the database and return (success, tasks by name)."""
+    config.tasks_yaml_path(target).write_text(pipeline_yaml)
+    runner = TaskRunner(target, use_database=False)
+    success = runner.run()
+    return success, {name: task for name, task in runner.tasks.items()}
+
+
+def test_pipe_task_passes_output_between_stages(target):
+    success, tasks = run_pipeline(target, """
+pipeline:
+  - name: sorted
+    kind: pipe
+    cmds:
+      - [printf, "b\\\\na\\\\n"]
+      - [sort]
+""")
+    assert success
+    assert tasks["sorted"].return_code == 0
+    stdout_log = config.for_target(target).task_logs_dir / "01_sorted_stdout.log"
+    assert stdout_log.read_text() == "a\nb\n"
+
+
+def test_pipe_task_with_failing_middle_stage_fails(target):
+    success, tasks = run_pipeline(target, """
+pipeline:
+  - name: broken
+    kind: pipe
+    cmds:
+      - [echo, hi]
+      - ["false"]
+      - [cat]
+""")
+    assert not success
+    assert tasks["broken"].return_code not in (0, None)
+
+
+def test_pipe_task_ignores_sigpipe_of_upstream_stage(target):
+    success, tasks = run_pipeline(target, """
+pipeline:
+  - name: head
+    kind: pipe
+    cmds:
+      - ["yes"]
+      - [head, -n, "1"]
+""")
+    assert success
+    assert tasks["head"].return_code == 0